@@ -3,31 +3,118 @@
 Tool to pack a directory into a .docx, .pptx, or .xlsx file with XML formatting undone.
 
 Example usage:
-    python pack.py <input_directory> <office_file> [--force]
+    python pack.py <input_directory> <office_file> [--force] [--jobs N] [--incremental]
+                   [--original <original_file>] [--compression .png=store ...]
 """
 
 import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
 import shutil
+import struct
 import subprocess
 import sys
 import tempfile
+import time
+import xml.parsers.expat
+import zlib
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Bump when a change to condensing makes previously packed members stale
+MANIFEST_VERSION = 1
+
+# Python versions whose ZipFile internals _copy_compressed() relies on to
+# write compressed data as it is; other versions compress it again
+RAW_COPY_VERSIONS = ((3, 8), (3, 14))
+
+# Compression of members by file extension, as (compress_type, compresslevel);
+# a level of None is zlib's default. Media that is already compressed gains
+# nothing from deflate, so it is stored. Other members are deflated.
+DEFAULT_COMPRESSION = (zipfile.ZIP_DEFLATED, None)
+COMPRESSION_POLICY = {
+    ext: (zipfile.ZIP_STORED, None)
+    for ext in (
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".wdp",
+        ".mp3",
+        ".m4a",
+        ".mp4",
+        ".m4v",
+        ".mov",
+        ".wmv",
+        ".wma",
+    )
+}
+
 
 def main():
     parser = argparse.ArgumentParser(description="Pack a directory into an Office file")
     parser.add_argument("input_directory", help="Unpacked Office document directory")
     parser.add_argument("output_file", help="Output Office file (.docx/.pptx/.xlsx)")
     parser.add_argument("--force", action="store_true", help="Skip validation")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes condensing XML parts (0 uses all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the members of the previous incremental pack that did not change",
+    )
+    parser.add_argument(
+        "--original",
+        help="Original Office file; its members identical to the files being "
+        "packed (such as media) are copied without recompressing them",
+    )
+    parser.add_argument(
+        "--compression",
+        action="append",
+        default=[],
+        metavar="EXT=METHOD",
+        help="Compression of members with extension EXT: store, deflate or "
+        "deflate:LEVEL (may be repeated; overrides the default policy)",
+    )
     args = parser.parse_args()
 
     try:
+        compression = dict(parse_compression(spec) for spec in args.compression)
+        stats = PackStats()
         success = pack_document(
-            args.input_directory, args.output_file, validate=not args.force
+            args.input_directory,
+            args.output_file,
+            validate=not args.force,
+            jobs=args.jobs,
+            incremental=args.incremental,
+            original=args.original,
+            compression=compression,
+            stats=stats,
         )
 
+        if success and args.incremental:
+            print(f"Incremental pack: reused {stats.reused} of {stats.members} members")
+        if success and args.original is not None:
+            print(
+                f"Packed {stats.members} members in {stats.elapsed:.2f}s: "
+                f"{len(stats.copied)} copied from the original without recompressing "
+                f"({sum(stats.copied) / 2**20:.1f} MB; "
+                f"{stats.saved_bytes / 2**20:.1f} MB not compressed again, "
+                f"saving about {stats.saved_time():.2f}s), "
+                f"{len(stats.stored)} stored uncompressed "
+                f"({sum(stats.stored) / 2**20:.1f} MB)"
+            )
+
         # Show warning if validation was skipped
         if args.force:
             print("Warning: Skipped validation, file may be corrupt", file=sys.stderr)
@@ -42,13 +129,38 @@ def main():
         sys.exit(f"Error: {e}")
 
 
-def pack_document(input_dir, output_file, validate=False):
+def pack_document(
+    input_dir,
+    output_file,
+    validate=False,
+    jobs=1,
+    incremental=False,
+    original=None,
+    compression=None,
+    stats=None,
+):
     """Pack a directory into an Office file (.docx/.pptx/.xlsx).
 
     Args:
         input_dir: Path to unpacked Office document directory
         output_file: Path to output Office file
         validate: If True, validates with soffice (default: False)
+        jobs: Number of processes condensing XML parts; 0 uses all CPUs
+            (default: 1). Members are written in the same order either way.
+        incremental: If True, members whose source files are unchanged since
+            the previous incremental pack into output_file are copied from it
+            still compressed; only changed files are condensed and deflated.
+            A manifest of the source files is kept next to output_file (see
+            manifest_path()).
+        original: Path to the original Office file. Its members whose data
+            is identical to a file being packed (same size and CRC-32, then
+            confirmed byte for byte) are copied still compressed, as they
+            are. XML files are condensed, so in practice these are media,
+            fonts and embedded objects.
+        compression: Overrides of COMPRESSION_POLICY, mapping extensions
+            (".png") to (compress_type, compresslevel) pairs.
+        stats: A PackStats to fill in with what was packed and how; nothing
+            is printed, so callers report it as they see fit.
 
     Returns:
         bool: True if successful, False if validation failed
@@ -60,30 +172,327 @@ def pack_document(input_dir, output_file, validate=False):
         raise ValueError(f"{input_dir} is not a directory")
     if output_file.suffix.lower() not in {".docx", ".pptx", ".xlsx"}:
         raise ValueError(f"{output_file} must be a .docx, .pptx, or .xlsx file")
+    if original is not None:
+        original = Path(original)
+        if not zipfile.is_zipfile(original):
+            raise ValueError(f"{original} is not an Office file")
+    policy = dict(COMPRESSION_POLICY, **(compression or {}))
+    start = time.perf_counter()
+
+    files = [f for f in input_dir.rglob("*") if f.is_file()]
+
+    # Members that can be copied from the previous pack, by source file
+    previous = _PreviousPack.load(input_dir, output_file) if incremental else None
+    sources = {}
+    reused = {}
+    if incremental:
+        for f in files:
+            arcname = f.relative_to(input_dir).as_posix()
+            sources[arcname], info = _source_entry(f, arcname, previous)
+            if info is not None:
+                reused[f] = info
+    if incremental and previous is not None and previous.policy != _policy_key(policy):
+        # Reused members would keep the compression of the previous pack
+        reused = {}
+    xml_files = [
+        f for f in files if f.name.endswith((".xml", ".rels")) and f not in reused
+    ]
+
+    # Stream every member straight into the archive; the input directory is
+    # only read, and nothing is copied to disk on the way. An incremental
+    # pack reads the previous output, and the original may be the output
+    # itself, so they write next to it first.
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    target = output_file
+    replace = incremental or original is not None
+    if replace:
+        target = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    if stats is None:
+        stats = PackStats()
+    stats.members = len(files)
+    stats.reused = len(reused)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            if previous is not None:
+                stack.callback(previous.archive.close)
+            original_zip = None
+            if original is not None:
+                original_zip = stack.enter_context(zipfile.ZipFile(original))
+            condensed = None
+            if jobs != 1:
+                pool = stack.enter_context(ProcessPoolExecutor(jobs or None))
+                # Results come back in submission order, which keeps the
+                # members in the same order as a serial run
+                condensed = pool.map(condense_xml, xml_files, chunksize=8)
+            zf = stack.enter_context(zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED))
+
+            for f in files:
+                arcname = f.relative_to(input_dir)
+                compress_type, compresslevel = _compression(f, policy)
+                if f in reused:
+                    info = zipfile.ZipInfo.from_file(f, arcname)
+                    _copy_compressed(previous.archive, reused[f], zf, info)
+                elif f.name.endswith((".xml", ".rels")):
+                    # Remove pretty-printing whitespace from XML files
+                    info = zipfile.ZipInfo.from_file(f, arcname)
+                    info.compress_type = compress_type
+                    if condensed is not None:
+                        zf.writestr(info, next(condensed), compresslevel=compresslevel)
+                    elif compresslevel is None:
+                        with zf.open(info, "w") as member:
+                            condense_xml(f, member)
+                    else:
+                        zf.writestr(info, condense_xml(f), compresslevel=compresslevel)
+                elif (
+                    original_info := _identical_member(original_zip, f, arcname)
+                ) is not None:
+                    info = zipfile.ZipInfo.from_file(f, arcname)
+                    if _copy_compressed(original_zip, original_info, zf, info):
+                        stats.copied.append(info.file_size)
+                        if info.compress_type != zipfile.ZIP_STORED:
+                            stats.recompressions.append((info.file_size, f))
+                else:
+                    zf.write(f, arcname, compress_type, compresslevel)
+                    if compress_type == zipfile.ZIP_STORED:
+                        stats.stored.append(f.stat().st_size)
+        if replace:
+            os.replace(target, output_file)
+    finally:
+        if replace:
+            target.unlink(missing_ok=True)
+
+    if incremental:
+        _write_manifest(input_dir, output_file, sources, policy)
+    stats.elapsed = time.perf_counter() - start
+
+    # Validate if requested
+    if validate:
+        if not validate_document(output_file):
+            output_file.unlink()  # Delete the corrupt file
+            return False
+
+    return True
+
+
+class PackStats:
+    """What pack_document() did, for its caller to report."""
+
+    def __init__(self):
+        self.members = 0
+        self.reused = 0  # Members copied from the previous incremental pack
+        self.copied = []  # Sizes of members copied from the original as they are
+        # (size, source file) of the copied members that are compressed
+        self.recompressions = []
+        self.stored = []  # Sizes of members stored uncompressed
+        self.elapsed = 0.0
+
+    @property
+    def saved_bytes(self):
+        """Bytes copied from the original that were not compressed again."""
+        return sum(size for size, _ in self.recompressions)
+
+    def saved_time(self):
+        """Estimate the seconds compressing saved_bytes again would have taken."""
+        if not self.recompressions:
+            return 0.0
+        return _compression_time(max(self.recompressions)[1], self.saved_bytes)
+
+
+def manifest_path(output_file):
+    """Return the manifest that --incremental keeps for output_file."""
+    output_file = Path(output_file)
+    return output_file.with_name(f".{output_file.name}.pack.json")
+
+
+class _PreviousPack:
+    """The output of the previous incremental pack, with its source manifest."""
+
+    def __init__(self, members, policy, archive):
+        # Part name -> [size, mtime_ns, sha256] of its source file
+        self.members = members
+        self.policy = policy
+        self.archive = archive
+
+    @classmethod
+    def load(cls, input_dir, output_file):
+        """Return the previous pack of input_dir into output_file, or None."""
+        try:
+            manifest = json.loads(manifest_path(output_file).read_text("utf-8"))
+            stat = output_file.stat()
+            if (
+                manifest["version"] != MANIFEST_VERSION
+                or manifest["input_dir"] != str(input_dir.resolve())
+                or manifest["output"] != [stat.st_size, stat.st_mtime_ns]
+            ):
+                # Packed from elsewhere, by another version, or since replaced
+                return None
+            return cls(
+                manifest["members"],
+                manifest["compression"],
+                zipfile.ZipFile(output_file),
+            )
+        except (OSError, ValueError, KeyError, TypeError, zipfile.BadZipFile):
+            return None
+
+
+def _source_entry(path, arcname, previous):
+    """Return the manifest entry of a source file and its reusable ZipInfo.
+
+    The ZipInfo is that of the previous pack's member, or None if the file
+    changed since. Files whose size and modification time are unchanged are
+    trusted without hashing them again.
+    """
+    stat = path.stat()
+    old = previous.members.get(arcname) if previous is not None else None
+    if old is not None and old[:2] == [stat.st_size, stat.st_mtime_ns]:
+        entry = old
+    else:
+        entry = [stat.st_size, stat.st_mtime_ns, _file_sha256(path)]
+
+    if old is None or entry[0] != old[0] or entry[2] != old[2]:
+        return entry, None
+    try:
+        return entry, previous.archive.getinfo(arcname)
+    except KeyError:
+        return entry, None
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_manifest(input_dir, output_file, members, policy):
+    stat = output_file.stat()
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "input_dir": str(input_dir.resolve()),
+        "output": [stat.st_size, stat.st_mtime_ns],
+        "compression": _policy_key(policy),
+        "members": members,
+    }
+    manifest_path(output_file).write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def parse_compression(spec):
+    """Parse "EXT=store", "EXT=deflate" or "EXT=deflate:LEVEL" into a policy entry."""
+    ext, _, method = spec.partition("=")
+    method, _, level = method.partition(":")
+    if not ext or method not in ("store", "deflate") or (level and method == "store"):
+        raise ValueError(f"Invalid compression {spec!r}: expected EXT=METHOD")
+    if level and not (level.isdigit() and 0 <= int(level) <= 9):
+        raise ValueError(f"Invalid compression {spec!r}: level must be 0-9")
+    ext = ext.lower() if ext.startswith(".") else f".{ext.lower()}"
+    if method == "store":
+        return ext, (zipfile.ZIP_STORED, None)
+    return ext, (zipfile.ZIP_DEFLATED, int(level) if level else None)
+
+
+def _compression(path, policy):
+    # ".rels" files have no suffix of their own
+    ext = path.suffix.lower() or path.name.lower()
+    return policy.get(ext, DEFAULT_COMPRESSION)
+
+
+def _policy_key(policy):
+    return sorted([ext, list(entry)] for ext, entry in policy.items())
 
-    # Work in temporary directory to avoid modifying original
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_content_dir = Path(temp_dir) / "content"
-        shutil.copytree(input_dir, temp_content_dir)
-
-        # Process XML files to remove pretty-printing whitespace
-        for pattern in ["*.xml", "*.rels"]:
-            for xml_file in temp_content_dir.rglob(pattern):
-                condense_xml(xml_file)
-
-        # Create final Office file as zip archive
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with zipfile.ZipFile(output_file, "w", zipfile.ZIP_DEFLATED) as zf:
-            for f in temp_content_dir.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(temp_content_dir))
-
-        # Validate if requested
-        if validate:
-            if not validate_document(output_file):
-                output_file.unlink()  # Delete the corrupt file
-                return False
 
+def _identical_member(archive, path, arcname):
+    """Return the ZipInfo of archive's member holding the same data as path, or None.
+
+    Candidates are matched by size and CRC-32, then confirmed by comparing
+    their data with the file byte for byte.
+    """
+    if archive is None or path.name.endswith((".xml", ".rels")):
+        return None
+    try:
+        info = archive.getinfo(arcname.as_posix())
+    except KeyError:
+        return None
+    if info.file_size != path.stat().st_size or info.flag_bits & 0x1:
+        return None
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(chunk, crc)
+    if crc != info.CRC:
+        return None
+
+    # A CRC-32 match can be a collision; only identical data may be copied
+    with open(path, "rb") as f, archive.open(info) as member:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            if member.read(len(chunk)) != chunk:
+                return None
+    return info
+
+
+def _compression_time(path, size):
+    """Estimate the seconds deflating size bytes of data like path's would take."""
+    with open(path, "rb") as f:
+        sample = f.read(1 << 20)
+    if not sample:
+        return 0.0
+    start = time.perf_counter()
+    zlib.compress(sample)
+    return (time.perf_counter() - start) * size / len(sample)
+
+
+def _copy_compressed(source, source_info, target, info):
+    """Copy a member of the ZipFile source into target without recompressing it.
+
+    info supplies the name, date and attributes of the new member; its
+    compression, CRC and sizes are taken from source_info. Stored members
+    are copied through ZipFile.open(). The public API has no way to write
+    data that is already compressed, so on the Python versions in
+    RAW_COPY_VERSIONS it is written through ZipFile internals; on others it
+    is decompressed and compressed again. Returns False in that case, and
+    True if the data was copied as it is.
+    """
+    info.compress_type = source_info.compress_type
+    info.file_size = source_info.file_size
+    oldest, newest = RAW_COPY_VERSIONS
+    if (
+        source_info.compress_type == zipfile.ZIP_STORED
+        or source.filename is None
+        or not oldest <= sys.version_info[:2] <= newest
+    ):
+        with source.open(source_info) as data, target.open(info, "w") as member:
+            shutil.copyfileobj(data, member, 1 << 20)
+        return source_info.compress_type == zipfile.ZIP_STORED
+
+    with open(source.filename, "rb") as data:
+        data.seek(source_info.header_offset)
+        header = data.read(30)
+        if header[:4] != b"PK\x03\x04":
+            raise zipfile.BadZipFile(f"Bad local header for {source_info.filename}")
+        name_length, extra_length = struct.unpack("<HH", header[26:30])
+        data.seek(source_info.header_offset + 30 + name_length + extra_length)
+
+        info.CRC = source_info.CRC
+        info.compress_size = source_info.compress_size
+        zip64 = max(info.file_size, info.compress_size) > zipfile.ZIP64_LIMIT
+
+        # What ZipFile.open(..., "w") does for a member, with the data known
+        target._writecheck(info)
+        target._didModify = True
+        target.fp.seek(target.start_dir)
+        info.header_offset = target.start_dir
+        target.fp.write(info.FileHeader(zip64))
+        remaining = info.compress_size
+        while remaining:
+            chunk = data.read(min(remaining, 1 << 20))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated data for {source_info.filename}")
+            target.fp.write(chunk)
+            remaining -= len(chunk)
+        target.filelist.append(info)
+        target.NameToInfo[info.filename] = info
+        target.start_dir = target.fp.tell()
     return True
 
 
@@ -130,8 +539,187 @@ def validate_document(doc_path):
             return False
 
 
-def condense_xml(xml_file):
-    """Strip unnecessary whitespace and remove comments."""
+def condense_xml(xml_file, output=None):
+    """Return the XML of xml_file without unnecessary whitespace and comments.
+
+    With output, a binary stream, the XML is written to it instead. The part
+    is streamed through expat, and the output is byte-identical to rewriting
+    it with minidom (see _condense_xml_dom()). Whitespace-only text and
+    comments are dropped from every element except w:t-like ones (tag names
+    ending in ":t").
+    """
+    destination = io.BytesIO() if output is None else output
+    try:
+        with open(xml_file, "r", encoding="utf-8") as f:
+            _XMLCondenser(destination).feed(f)
+    except _DoctypeFound:
+        # Rare in Office parts; minidom writes document types its own way.
+        # Nothing has been written yet, as the root element comes later.
+        destination.write(_condense_xml_dom(xml_file))
+    if output is None:
+        return destination.getvalue()
+
+
+class _DoctypeFound(Exception):
+    pass
+
+
+class _XMLCondenser:
+    """expat handlers that write condensed XML the way minidom's toxml() does."""
+
+    # Output is written in batches of this many pieces
+    BATCH = 4096
+
+    def __init__(self, destination):
+        self.destination = destination
+        self.parser = xml.parsers.expat.ParserCreate(namespace_separator=" ")
+        self.parser.namespace_prefixes = True
+        self.parser.ordered_attributes = True
+        self.parser.buffer_text = True
+        self.parser.StartDoctypeDeclHandler = self.start_doctype
+        self.parser.StartNamespaceDeclHandler = self.start_namespace
+        self.parser.StartElementHandler = self.start_element
+        self.parser.EndElementHandler = self.end_element
+        self.parser.CharacterDataHandler = self.character_data
+        self.parser.CommentHandler = self.comment
+        self.parser.ProcessingInstructionHandler = self.processing_instruction
+        self.parser.StartCdataSectionHandler = self.start_cdata
+        self.parser.EndCdataSectionHandler = self.end_cdata
+
+        self.output = ['<?xml version="1.0" encoding="UTF-8"?>']
+        # Open elements as [tag name, keeps whitespace, start tag still open]
+        self.stack = []
+        self.namespaces = []
+        self.text = []
+        self.in_cdata = False
+        self.cdata = None
+
+    def feed(self, f):
+        while chunk := f.read(16 * 1024):
+            self.parser.Parse(chunk, False)
+        self.parser.Parse(b"", True)
+        self._write()
+
+    def _write(self):
+        self.destination.write("".join(self.output).encode("utf-8"))
+        self.output = []
+
+    def _qname(self, name):
+        # "uri localname prefix", "uri localname" or "localname"
+        parts = name.split(" ")
+        if len(parts) == 3:
+            return f"{parts[2]}:{parts[1]}"
+        return parts[-1]
+
+    def _open_child(self):
+        """Close the start tag of the current element before its first child."""
+        if self.stack and self.stack[-1][2]:
+            self.output.append(">")
+            self.stack[-1][2] = False
+
+    def _flush_text(self):
+        # Adjacent character data forms one text node, as in minidom
+        if not self.text or not self.stack:
+            self.text = []
+            return
+        text = "".join(self.text)
+        self.text = []
+        if self.stack[-1][1] or text.strip() != "":
+            self._open_child()
+            self.output.append(_escape_text(text))
+
+    def start_doctype(self, *args):
+        raise _DoctypeFound()
+
+    def start_namespace(self, prefix, uri):
+        self.namespaces.append((prefix, uri))
+
+    def start_element(self, name, attributes):
+        self._flush_text()
+        self._open_child()
+        tag = self._qname(name)
+        self.output.append(f"<{tag}")
+        # minidom lists namespace declarations before the other attributes
+        for prefix, uri in self.namespaces:
+            xmlns = f"xmlns:{prefix}" if prefix else "xmlns"
+            self.output.append(f' {xmlns}="{_escape_attribute(uri)}"')
+        self.namespaces = []
+        for k in range(0, len(attributes), 2):
+            self.output.append(
+                f' {self._qname(attributes[k])}="{_escape_attribute(attributes[k + 1])}"'
+            )
+        self.stack.append([tag, tag.endswith(":t"), True])
+
+    def end_element(self, name):
+        self._flush_text()
+        tag, _, empty = self.stack.pop()
+        self.output.append("/>" if empty else f"</{tag}>")
+        if len(self.output) >= self.BATCH:
+            self._write()
+
+    def character_data(self, data):
+        if not self.in_cdata:
+            self.text.append(data)
+        elif self.cdata is None:
+            # An empty CDATA section adds no node, so text is only split here
+            self._flush_text()
+            self.cdata = [data]
+        else:
+            self.cdata.append(data)
+
+    def comment(self, data):
+        self._flush_text()
+        if not self.stack or self.stack[-1][1]:
+            self._open_child()
+            self.output.append(f"<!--{data}-->")
+
+    def processing_instruction(self, target, data):
+        self._flush_text()
+        self._open_child()
+        self.output.append(f"<?{target} {data}?>")
+
+    def start_cdata(self):
+        self.in_cdata = True
+
+    def end_cdata(self):
+        if self.cdata is not None:
+            self._open_child()
+            self.output.append(f"<![CDATA[{''.join(self.cdata)}]]>")
+        self.in_cdata = False
+        self.cdata = None
+
+
+# Escaping as the running Python's minidom does it. Since 3.13 it escapes '"'
+# only in attribute values, where it also escapes tabs and line breaks.
+if sys.version_info >= (3, 13):
+
+    def _escape_text(data):
+        return data.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+    def _escape_attribute(data):
+        return (
+            _escape_text(data)
+            .replace('"', "&quot;")
+            .replace("\r", "&#13;")
+            .replace("\n", "&#10;")
+            .replace("\t", "&#9;")
+        )
+
+else:
+
+    def _escape_text(data):
+        return (
+            data.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace('"', "&quot;")
+            .replace(">", "&gt;")
+        )
+
+    _escape_attribute = _escape_text
+
+
+def _condense_xml_dom(xml_file):
+    """Return the condensed XML of xml_file, built with minidom."""
     with open(xml_file, "r", encoding="utf-8") as f:
         dom = defusedxml.minidom.parse(f)
 
@@ -150,9 +738,7 @@ def condense_xml(xml_file):
             ) or child.nodeType == child.COMMENT_NODE:
                 element.removeChild(child)
 
-    # Write back the condensed XML
-    with open(xml_file, "wb") as f:
-        f.write(dom.toxml(encoding="UTF-8"))
+    return dom.toxml(encoding="UTF-8")
 
 
 if __name__ == "__main__":
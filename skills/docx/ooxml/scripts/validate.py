@@ -3,25 +3,68 @@
 Command line tool to validate Office document XML files against XSD schemas and tracked changes.
 
 Usage:
-    python validate.py <dir> --original <original_file>
+    python validate.py <dir> --original <original_file> [--incremental] [--jobs N]
+    python validate.py <file.docx> --original <original_file>
+    python validate.py <dir> --original <original_file> --level quick --fail-fast
+    python validate.py <dir> --original <original_file> --check xml --check unique_ids
+    python validate.py <dir> --original <original_file> --format json --profile
+
+The document to check may be an unpacked directory or a packed .docx/.pptx/.xlsx,
+which is read directly from the archive without unpacking it.
+
+Checks run cheapest first. Levels select checks by cost: quick (package
+structure), structural (adds checks that walk every element) and full (adds
+XSD validation and the comparison with the original; the default). With
+--fail-fast, the run stops before the next, more expensive, class of checks
+once a check has failed.
+
+--format json prints one JSON document with every check's result, issues
+(part, line, message), time and bytes parsed. --profile adds a table of the
+time and bytes parsed per check.
+
+Validation server (keeps compiled schemas and original packages in memory):
+    python validate.py --serve /tmp/ooxml-validate.sock
+    python validate.py <dir> --original <original_file> --socket /tmp/ooxml-validate.sock
+
+The client prints the same output and exits with the same code as a one-shot run.
+The socket can also be given with the OOXML_VALIDATION_SOCKET environment variable.
+
+Schema bundles (one pre-resolved file per root schema, built on first use):
+    python validate.py --build-schema-bundles
+
+Batch validation (one JSON line with status and timing per document):
+    python validate.py --batch manifest.jsonl --workers 8 --output results.jsonl
+    python validate.py --batch <dir_of_documents> [--original <original_file>]
 """
 
 import argparse
+import json
+import os
+import socket
 import sys
+import time
+import zipfile
 from pathlib import Path
 
-from validation import DOCXSchemaValidator, PPTXSchemaValidator, RedliningValidator
+
+def request_validation(socket_path, request):
+    """Send one validate request to a running server and return its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(socket_path))
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as response:
+            return json.loads(response.readline())
 
 
 def main():
     parser = argparse.ArgumentParser(description="Validate Office document XML files")
     parser.add_argument(
         "unpacked_dir",
-        help="Path to unpacked Office document directory",
+        nargs="?",
+        help="Path to unpacked Office document directory or packed Office file",
     )
     parser.add_argument(
         "--original",
-        required=True,
         help="Path to original file (.docx/.pptx/.xlsx)",
     )
     parser.add_argument(
@@ -30,40 +73,203 @@ def main():
         action="store_true",
         help="Enable verbose output",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the persistent baseline error cache",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-run checks for parts that changed since the previous run",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes for XSD validation (0 uses all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--check",
+        action="append",
+        dest="checks",
+        metavar="NAME",
+        help="Only run the named check (repeatable), e.g. xml, against_xsd, redlining",
+    )
+    parser.add_argument(
+        "--level",
+        choices=["quick", "structural", "full"],
+        default="full",
+        help="Which checks to run, by cost (default: full)",
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Skip the more expensive checks once a check has failed",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Report format (default: text)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time and bytes parsed per check",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="Run a validation server listening on the Unix socket SOCKET",
+    )
+    parser.add_argument(
+        "--socket",
+        default=os.environ.get("OOXML_VALIDATION_SOCKET"),
+        help="Send the request to the validation server listening on SOCKET",
+    )
+    parser.add_argument(
+        "--build-schema-bundles",
+        action="store_true",
+        help="Resolve the import graph of every schema into the bundle cache and exit",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="SOURCE",
+        help="Validate the (document, original) pairs of a JSON-lines manifest "
+        "or a directory of documents",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Number of worker processes for --batch (0 uses all CPUs, default: 0)",
+    )
+    parser.add_argument(
+        "--output",
+        help="Write --batch results to this JSON-lines file instead of stdout",
+    )
     args = parser.parse_args()
 
+    if args.serve:
+        from validation.server import serve
+
+        serve(args.serve)
+        return
+
+    if args.batch:
+        run_batch_command(args)
+        return
+
+    if args.build_schema_bundles:
+        from validation.runner import build_schema_bundles
+        from validation.schemas import SCHEMA_BUNDLES
+
+        paths = build_schema_bundles()
+        print(f"Built {len(paths)} schema bundles in {SCHEMA_BUNDLES.directory}")
+        return
+
+    if args.unpacked_dir is None or args.original is None:
+        parser.error("the following arguments are required: unpacked_dir, --original")
+
     # Validate paths
     unpacked_dir = Path(args.unpacked_dir)
     original_file = Path(args.original)
     file_extension = original_file.suffix.lower()
-    assert unpacked_dir.is_dir(), f"Error: {unpacked_dir} is not a directory"
+    assert unpacked_dir.is_dir() or zipfile.is_zipfile(unpacked_dir), (
+        f"Error: {unpacked_dir} is not a directory or Office file"
+    )
     assert original_file.is_file(), f"Error: {original_file} is not a file"
     assert file_extension in [".docx", ".pptx", ".xlsx"], (
         f"Error: {original_file} must be a .docx, .pptx, or .xlsx file"
     )
+    jobs = args.jobs or os.cpu_count() or 1
+
+    if args.socket:
+        request = {
+            "document": str(unpacked_dir.resolve()),
+            "original": str(original_file.resolve()),
+            "verbose": args.verbose,
+            "incremental": args.incremental,
+            "jobs": jobs,
+            "checks": args.checks,
+            "level": args.level,
+            "fail_fast": args.fail_fast,
+            "format": args.format,
+            "profile": args.profile,
+            "no_cache": args.no_cache,
+        }
+        try:
+            response = request_validation(args.socket, request)
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(
+                f"Warning: No validation server at {args.socket}, validating in-process",
+                file=sys.stderr,
+            )
+        else:
+            sys.stdout.write(response["stdout"])
+            sys.stderr.write(response["stderr"])
+            sys.exit(response["exit_code"])
 
-    # Run validations
-    match file_extension:
-        case ".docx":
-            validators = [DOCXSchemaValidator, RedliningValidator]
-        case ".pptx":
-            validators = [PPTXSchemaValidator]
-        case _:
-            print(f"Error: Validation not supported for file type {file_extension}")
-            sys.exit(1)
+    # Imported here so that server clients do not load lxml and the validators
+    from validation.cache import BASELINE_ERROR_CACHE
+    from validation.runner import run_validation
 
-    # Run validators
-    success = True
-    for V in validators:
-        validator = V(unpacked_dir, original_file, verbose=args.verbose)
-        if not validator.validate():
-            success = False
+    if args.no_cache:
+        BASELINE_ERROR_CACHE.enabled = False
 
-    if success:
-        print("All validations PASSED!")
+    success = run_validation(
+        unpacked_dir,
+        original_file,
+        verbose=args.verbose,
+        incremental=args.incremental,
+        jobs=jobs,
+        checks=args.checks,
+        level=args.level,
+        fail_fast=args.fail_fast,
+        output_format=args.format,
+        profile=args.profile,
+    )
 
     sys.exit(0 if success else 1)
 
 
+def run_batch_command(args):
+    """Validate every pair listed by --batch and exit 1 if any of them failed."""
+    from validation.batch import read_pairs, run_batch
+
+    start = time.perf_counter()
+    try:
+        pairs = read_pairs(args.batch, args.original)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    options = {
+        "verbose": args.verbose,
+        "incremental": args.incremental,
+        "checks": args.checks,
+        "level": args.level,
+        "fail_fast": args.fail_fast,
+        "format": args.format,
+        "profile": args.profile,
+        "no_cache": args.no_cache,
+    }
+    workers = args.workers or os.cpu_count() or 1
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            failures = run_batch(pairs, output, workers, options)
+    else:
+        failures = run_batch(pairs, sys.stdout, workers, options)
+
+    print(
+        f"Validated {len(pairs)} documents in {time.perf_counter() - start:.1f}s "
+        f"with {workers} workers: {len(pairs) - failures} passed, {failures} failed",
+        file=sys.stderr,
+    )
+    sys.exit(0 if failures == 0 else 1)
+
+
 if __name__ == "__main__":
     main()
@@ -2,11 +2,24 @@
 Base validator with common validation logic for document files.
 """
 
+import copy
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import lxml.etree
 
+from .baseline import load_baseline
+from .cache import BASELINE_ERROR_CACHE
+from .checks import DEFAULT_LEVEL, schedule
+from .incremental import IncrementalManifest
+from .index import PackageIndex
+from .package import open_package
+from .parts import PartStore
+from .results import Issue, run_check
+from .schemas import SCHEMA_BUNDLES, SCHEMA_CACHE, SCHEMAS_DIR
+from .visitors import PartVisitor, local_name, walk
+
 
 class BaseSchemaValidator:
     """Base validator with common validation logic for document files."""
@@ -66,6 +79,12 @@ class BaseSchemaValidator:
         "drawing": "ISO-IEC29500-4_2016/dml-main.xsd",
     }
 
+    # Compiled XSD schemas, shared by all validators in the process
+    schema_cache = SCHEMA_CACHE
+
+    # Baseline XSD errors of original files, persisted across runs
+    baseline_cache = BASELINE_ERROR_CACHE
+
     # Unified namespace constants
     MC_NAMESPACE = "http://schemas.openxmlformats.org/markup-compatibility/2006"
     XML_NAMESPACE = "http://www.w3.org/XML/1998/namespace"
@@ -103,172 +122,358 @@ class BaseSchemaValidator:
         "http://www.w3.org/XML/1998/namespace",
     }
 
-    def __init__(self, unpacked_dir, original_file, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir).resolve()
+    # Checks run by validate(), as (name, cost class) pairs; each is
+    # implemented by a validate_<name>() method. Subclasses list their own.
+    CHECKS = []
+
+    # Parts larger than this many bytes are streamed by the non-XSD checks
+    STREAMING_THRESHOLD = 16 * 1024 * 1024
+
+    def __init__(
+        self, unpacked_dir, original_file, verbose=False, incremental=False, jobs=1
+    ):
+        # Unpacked directory or packed file; parts of a packed file are
+        # addressed by virtual paths below the file's own path
+        self.package = open_package(unpacked_dir)
+        self.unpacked_dir = self.package.root
         self.original_file = Path(original_file)
         self.verbose = verbose
 
+        # Number of worker processes used for XSD validation
+        self.jobs = jobs
+        self.pool_stats = None
+        self.worker_bytes_parsed = 0
+
+        # CheckResult of every check run by validate(), in run order
+        self.results = []
+        # Issues reported by the check that is running
+        self._issues = []
+
         # Set schemas directory
-        self.schemas_dir = Path(__file__).parent.parent.parent / "schemas"
+        self.schemas_dir = SCHEMAS_DIR
+
+        # Parsed trees shared by all checks of this validator; parts above
+        # the threshold are streamed instead of being held in memory
+        self.parts = PartStore(self.package, stream_threshold=self.STREAMING_THRESHOLD)
+
+        # Parts, relationships and content types, listed once for all checks
+        self.index = PackageIndex(self.package, self.parts)
 
         # Get all XML and .rels files
-        patterns = ["*.xml", "*.rels"]
-        self.xml_files = [
-            f for pattern in patterns for f in self.unpacked_dir.rglob(pattern)
-        ]
+        self.xml_files = self.index.with_suffix(".xml") + self.index.with_suffix(
+            ".rels"
+        )
 
         if not self.xml_files:
             print(f"Warning: No XML files found in {self.unpacked_dir}")
 
-    def validate(self):
-        """Run all validation checks and return True if all pass."""
-        raise NotImplementedError("Subclasses must implement the validate method")
+        # Results of the visitor-based checks, by part and check name
+        self._visited = {}
+
+        # Original package, opened lazily on first use
+        self._baseline = None
+
+        # Results of the previous run, reused for parts that did not change
+        self.incremental = None
+        if incremental:
+            self.incremental = IncrementalManifest(
+                self.package,
+                self.xml_files,
+                self.baseline.content_hash,
+                type(self).__name__,
+            )
+
+    @property
+    def baseline(self):
+        """In-memory view of the original package (see OriginalPackage)."""
+        if self._baseline is None:
+            self._baseline = load_baseline(self.original_file)
+        return self._baseline
+
+    def validate(self, level=DEFAULT_LEVEL, fail_fast=False, checks=None):
+        """Run the checks of a level (or only the named checks); True if all pass.
+
+        Checks run cheapest cost class first (see checks.schedule()). A failed
+        XML well-formedness check always ends the run, since the other checks
+        need parseable parts. With fail_fast, the run also ends after the
+        first cost class that had a failure.
+
+        Each check's outcome, time and bytes parsed are recorded in results.
+        """
+        all_valid = True
+        current_cost = None
+        for name, cost in schedule(self.CHECKS, level, checks):
+            if fail_fast and not all_valid and cost != current_cost:
+                break
+            current_cost = cost
+            if not self._run_check(name):
+                all_valid = False
+                if name == "xml":
+                    break
+        return self._finish_validation(all_valid)
+
+    def _run_check(self, name):
+        """Run validate_<name>(), record its CheckResult and return whether it passed."""
+        self._issues = []
+        result = run_check(
+            type(self).__name__,
+            name,
+            getattr(self, f"validate_{name}"),
+            self._bytes_parsed,
+        )
+        result.issues = self._issues
+        self.results.append(result)
+        return result.passed
+
+    def _fail(self, header, issues, footer=None, lines=None):
+        """Record the issues of a failed check and print its report; return False.
+
+        The report is header, then lines (by default each issue indented by
+        two spaces), then footer if given.
+        """
+        self._issues.extend(issues)
+        print(header)
+        if lines is None:
+            lines = [f"  {issue}" for issue in issues]
+        for line in lines:
+            print(line)
+        if footer is not None:
+            print(footer)
+        return False
+
+    def _relative(self, path):
+        """Return the part name of a path in the package."""
+        return str(path.relative_to(self.unpacked_dir))
+
+    def _bytes_parsed(self):
+        """Return the number of bytes of XML parsed so far on behalf of this validator."""
+        total = self.parts.bytes_parsed + self.worker_bytes_parsed
+        if self._baseline is not None:
+            total += self._baseline.bytes_parsed
+        return total
+
+    def _finish_validation(self, all_valid):
+        """Persist incremental state, report cache statistics and pass the result through."""
+        if self.incremental is not None:
+            self.incremental.save()
+        if self.verbose:
+            self.print_cache_stats()
+        return all_valid
+
+    def _part_result(self, check, xml_file, compute, depends_on=(), extra=None):
+        """Return compute(xml_file), reusing the previous run's result in incremental mode.
+
+        depends_on lists other parts the result is derived from (such as the
+        part's .rels file); a change to any of them, or to the string extra,
+        also forces a recompute.
+        Results must be JSON-serializable or lists of Issues.
+        """
+        if self.incremental is None:
+            return compute(xml_file)
+        return self.incremental.part_result(check, xml_file, compute, depends_on, extra)
+
+    def _visitor_result(self, check, xml_file, depends_on=()):
+        """_part_result() for a check implemented as a PartVisitor."""
+        return self._part_result(
+            check,
+            xml_file,
+            lambda xml_file: self._visit_part(xml_file)[check],
+            depends_on,
+        )
+
+    def _visit_part(self, xml_file):
+        """Run every visitor-based check on a part in one walk.
+
+        Returns {check name: result}; the walk happens once per part, on the
+        first request for any of its results.
+        """
+        key = str(xml_file)
+        if key not in self._visited:
+            visitors = self._part_visitors(xml_file)
+            try:
+                walk(self.parts.events(xml_file), visitors.values())
+            except Exception as e:
+                # The part could not be read; every unfinished check reports it
+                for visitor in visitors.values():
+                    if not visitor.failed:
+                        visitor.fail(e)
+            self._visited[key] = {
+                check: visitor.result() for check, visitor in visitors.items()
+            }
+        return self._visited[key]
+
+    def _part_visitors(self, xml_file):
+        """Return {check name: PartVisitor} for the checks that apply to a part.
+
+        Subclasses extend this with their format-specific checks.
+        """
+        visitors = {"unique_ids": UniqueIdVisitor(self, xml_file)}
+        if xml_file.suffix != ".rels":
+            rels_file = self.index.rels_file_for(xml_file)
+            if self.index.is_part(rels_file):
+                visitors["relationship_ids"] = RelationshipIdVisitor(
+                    self, xml_file, rels_file
+                )
+        return visitors
+
+    def _has_part_result(self, check, xml_file, depends_on=(), extra=None):
+        """Return True if _part_result would reuse a stored result instead of computing."""
+        if self.incremental is None:
+            return False
+        return self.incremental.has_part_result(check, xml_file, depends_on, extra)
+
+    def _package_result(self, check, compute, extra=None):
+        """Return compute() for a cross-part check, reusing the previous result in
+        incremental mode unless the file list, a .rels file, [Content_Types].xml
+        or extra changed. Results must be JSON-serializable or lists of Issues.
+        """
+        if self.incremental is None:
+            return compute()
+        return self.incremental.package_result(check, compute, extra)
+
+    def _baseline_result(self, check, compute):
+        """Return compute() for a fact about the original file, remembered across
+        incremental runs against the same original.
+        """
+        if self.incremental is None:
+            return compute()
+        return self.incremental.baseline_result(check, compute)
+
+    def print_cache_stats(self):
+        """Print how much work the shared caches saved during validation."""
+        print(
+            f"Parsed {self.parts.parses} parts, "
+            f"reused parsed trees {self.parts.saved} times"
+        )
+        print(
+            f"Schemas compiled {self.schema_cache.misses} times "
+            f"({self.schema_cache.compile_time:.2f}s), "
+            f"reused {self.schema_cache.hits} times"
+        )
+        if SCHEMA_BUNDLES.loaded or SCHEMA_BUNDLES.built:
+            print(
+                f"Schema bundles: {SCHEMA_BUNDLES.loaded} loaded, "
+                f"{SCHEMA_BUNDLES.built} built"
+            )
+        if self.baseline_cache.enabled:
+            print(
+                f"Baseline error cache: {self.baseline_cache.hits} hits, "
+                f"{self.baseline_cache.misses} misses"
+            )
+        if self.parts.streams:
+            print(f"Streamed {self.parts.streams} large parts")
+        if self.pool_stats:
+            # Workers keep their own caches, which are not counted above
+            pooled, workers = self.pool_stats
+            print(f"XSD validation of {pooled} parts ran in {workers} worker processes")
+        if self.incremental is not None:
+            print(
+                f"Incremental: {len(self.incremental.changed)} changed parts, "
+                f"reused {self.incremental.reused} results, "
+                f"recomputed {self.incremental.computed}"
+            )
 
     def validate_xml(self):
         """Validate that all XML files are well-formed."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                # Try to parse the XML file
-                lxml.etree.parse(str(xml_file))
-            except lxml.etree.XMLSyntaxError as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Line {e.lineno}: {e.msg}"
-                )
-            except Exception as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                    f"Unexpected error: {str(e)}"
-                )
+            errors.extend(self._part_result("xml", xml_file, self._xml_errors))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} XML violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"FAILED - Found {len(errors)} XML violations:", errors)
         else:
             if self.verbose:
                 print("PASSED - All XML files are well-formed")
             return True
 
+    def _xml_errors(self, xml_file):
+        """Return well-formedness errors for a single file."""
+        try:
+            # Try to parse the XML file
+            self.parts.check(xml_file)
+        except lxml.etree.XMLSyntaxError as e:
+            return [Issue(self._relative(xml_file), e.lineno, e.msg)]
+        except Exception as e:
+            return [
+                Issue(self._relative(xml_file), None, f"Unexpected error: {str(e)}")
+            ]
+        return []
+
     def validate_namespaces(self):
         """Validate that namespace prefixes in Ignorable attributes are declared."""
         errors = []
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
-
-                for attr_val in [
-                    v for k, v in root.attrib.items() if k.endswith("Ignorable")
-                ]:
-                    undeclared = set(attr_val.split()) - declared
-                    errors.extend(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Namespace '{ns}' in Ignorable but not declared"
-                        for ns in undeclared
-                    )
-            except lxml.etree.XMLSyntaxError:
-                continue
+            errors.extend(
+                self._part_result("namespaces", xml_file, self._namespace_errors)
+            )
 
         if errors:
-            print(f"FAILED - {len(errors)} namespace issues:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(f"FAILED - {len(errors)} namespace issues:", errors)
         if self.verbose:
             print("PASSED - All namespace prefixes properly declared")
         return True
 
+    def _namespace_errors(self, xml_file):
+        """Return undeclared Ignorable namespace prefixes in a single file."""
+        errors = []
+        try:
+            root = self.parts.shallow_root(xml_file)
+            declared = set(root.nsmap.keys()) - {None}  # Exclude default namespace
+
+            for attr_val in [
+                v for k, v in root.attrib.items() if k.endswith("Ignorable")
+            ]:
+                undeclared = set(attr_val.split()) - declared
+                errors.extend(
+                    Issue(
+                        self._relative(xml_file),
+                        None,
+                        f"Namespace '{ns}' in Ignorable but not declared",
+                    )
+                    for ns in undeclared
+                )
+        except lxml.etree.XMLSyntaxError:
+            pass
+        return errors
+
     def validate_unique_ids(self):
         """Validate that specific IDs are unique according to OOXML requirements."""
         errors = []
         global_ids = {}  # Track globally unique IDs across all files
 
         for xml_file in self.xml_files:
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                file_ids = {}  # Track IDs that must be unique within this file
+            entries = self._visitor_result("unique_ids", xml_file)
+            for entry in entries:
+                # File-level problems come back as ready-made issues
+                if isinstance(entry, Issue):
+                    errors.append(entry)
+                    continue
 
-                # Remove all mc:AlternateContent elements from the tree
-                mc_elements = root.xpath(
-                    ".//mc:AlternateContent", namespaces={"mc": self.MC_NAMESPACE}
-                )
-                for elem in mc_elements:
-                    elem.getparent().remove(elem)
-
-                # Now check IDs in the cleaned tree
-                for elem in root.iter():
-                    # Get the element name without namespace
-                    tag = (
-                        elem.tag.split("}")[-1].lower()
-                        if "}" in elem.tag
-                        else elem.tag.lower()
+                # Check global uniqueness
+                id_value, line, tag = entry
+                if id_value in global_ids:
+                    prev_file, prev_line, prev_tag = global_ids[id_value]
+                    errors.append(
+                        Issue(
+                            self._relative(xml_file),
+                            line,
+                            f"Global ID '{id_value}' in <{tag}> "
+                            f"already used in {prev_file} at line {prev_line} in <{prev_tag}>",
+                        )
+                    )
+                else:
+                    global_ids[id_value] = (
+                        xml_file.relative_to(self.unpacked_dir),
+                        line,
+                        tag,
                     )
-
-                    # Check if this element type has ID uniqueness requirements
-                    if tag in self.UNIQUE_ID_REQUIREMENTS:
-                        attr_name, scope = self.UNIQUE_ID_REQUIREMENTS[tag]
-
-                        # Look for the specified attribute
-                        id_value = None
-                        for attr, value in elem.attrib.items():
-                            attr_local = (
-                                attr.split("}")[-1].lower()
-                                if "}" in attr
-                                else attr.lower()
-                            )
-                            if attr_local == attr_name:
-                                id_value = value
-                                break
-
-                        if id_value is not None:
-                            if scope == "global":
-                                # Check global uniqueness
-                                if id_value in global_ids:
-                                    prev_file, prev_line, prev_tag = global_ids[
-                                        id_value
-                                    ]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Global ID '{id_value}' in <{tag}> "
-                                        f"already used in {prev_file} at line {prev_line} in <{prev_tag}>"
-                                    )
-                                else:
-                                    global_ids[id_value] = (
-                                        xml_file.relative_to(self.unpacked_dir),
-                                        elem.sourceline,
-                                        tag,
-                                    )
-                            elif scope == "file":
-                                # Check file-level uniqueness
-                                key = (tag, attr_name)
-                                if key not in file_ids:
-                                    file_ids[key] = {}
-
-                                if id_value in file_ids[key]:
-                                    prev_line = file_ids[key][id_value]
-                                    errors.append(
-                                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                        f"Line {elem.sourceline}: Duplicate {attr_name}='{id_value}' in <{tag}> "
-                                        f"(first occurrence at line {prev_line})"
-                                    )
-                                else:
-                                    file_ids[key][id_value] = elem.sourceline
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} ID uniqueness violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} ID uniqueness violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - All required IDs are unique")
@@ -278,10 +483,8 @@ class BaseSchemaValidator:
         """
         Validate that all .rels files properly reference files and that all files are referenced.
         """
-        errors = []
-
         # Find all .rels files
-        rels_files = list(self.unpacked_dir.rglob("*.rels"))
+        rels_files = self.index.with_suffix(".rels")
 
         if not rels_files:
             if self.verbose:
@@ -290,108 +493,103 @@ class BaseSchemaValidator:
 
         # Get all files in the unpacked directory (excluding reference files)
         all_files = []
-        for file_path in self.unpacked_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != "[Content_Types].xml"
-                and not file_path.name.endswith(".rels")
+        for file_path in self.index.files:
+            if file_path.name != "[Content_Types].xml" and not file_path.name.endswith(
+                ".rels"
             ):  # This file is not referenced by .rels
-                all_files.append(file_path.resolve())
-
-        # Track all files that are referenced by any .rels file
-        all_referenced_files = set()
+                all_files.append(file_path)
 
         if self.verbose:
             print(
                 f"Found {len(rels_files)} .rels files and {len(all_files)} target files"
             )
 
+        errors = self._package_result(
+            "file_references",
+            lambda: self._file_reference_errors(rels_files, all_files),
+        )
+
+        if errors:
+            return self._fail(
+                f"FAILED - Found {len(errors)} relationship validation errors:",
+                errors,
+                footer="CRITICAL: These errors will cause the document to appear corrupt. "
+                + "Broken references MUST be fixed, "
+                + "and unreferenced files MUST be referenced or removed.",
+            )
+        else:
+            if self.verbose:
+                print(
+                    "PASSED - All references are valid and all files are properly referenced"
+                )
+            return True
+
+    def _file_reference_errors(self, rels_files, all_files):
+        """Return broken and missing references across all .rels files."""
+        errors = []
+
+        # Track all files that are referenced by any .rels file
+        all_referenced_files = set()
+
         # Check each .rels file
         for rels_file in rels_files:
             try:
-                # Parse relationships file
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-
-                # Get the directory where this .rels file is located
-                rels_dir = rels_file.parent
-
-                # Find all relationships and their targets
-                referenced_files = set()
                 broken_refs = []
 
-                for rel in rels_root.findall(
-                    ".//ns:Relationship",
-                    namespaces={"ns": self.PACKAGE_RELATIONSHIPS_NAMESPACE},
-                ):
-                    target = rel.get("Target")
+                for rel in self.index.relationships(rels_file):
+                    target = rel.target
                     if target and not target.startswith(
                         ("http", "mailto:")
                     ):  # Skip external URLs
-                        # Resolve the target path relative to the .rels file location
-                        if rels_file.name == ".rels":
-                            # Root .rels file - targets are relative to unpacked_dir
-                            target_path = self.unpacked_dir / target
+                        # Targets are already resolved against the source part's folder
+                        if self.index.is_part(rel.target_path):
+                            all_referenced_files.add(rel.target_path)
                         else:
-                            # Other .rels files - targets are relative to their parent's parent
-                            # e.g., word/_rels/document.xml.rels -> targets relative to word/
-                            base_dir = rels_dir.parent
-                            target_path = base_dir / target
-
-                        # Normalize the path and check if it exists
-                        try:
-                            target_path = target_path.resolve()
-                            if target_path.exists() and target_path.is_file():
-                                referenced_files.add(target_path)
-                                all_referenced_files.add(target_path)
-                            else:
-                                broken_refs.append((target, rel.sourceline))
-                        except (OSError, ValueError):
                             broken_refs.append((target, rel.sourceline))
 
                 # Report broken references
                 if broken_refs:
-                    rel_path = rels_file.relative_to(self.unpacked_dir)
+                    rel_path = self._relative(rels_file)
                     for broken_ref, line_num in broken_refs:
                         errors.append(
-                            f"  {rel_path}: Line {line_num}: Broken reference to {broken_ref}"
+                            Issue(
+                                rel_path, line_num, f"Broken reference to {broken_ref}"
+                            )
                         )
 
             except Exception as e:
-                rel_path = rels_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error parsing {rel_path}: {e}")
+                rel_path = self._relative(rels_file)
+                errors.append(
+                    Issue(
+                        rel_path,
+                        None,
+                        f"Error parsing: {e}",
+                        text=f"Error parsing {rel_path}: {e}",
+                    )
+                )
 
         # Check for unreferenced files (files that exist but are not referenced anywhere)
         unreferenced_files = set(all_files) - all_referenced_files
 
         if unreferenced_files:
             for unref_file in sorted(unreferenced_files):
-                unref_rel_path = unref_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Unreferenced file: {unref_rel_path}")
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} relationship validation errors:")
-            for error in errors:
-                print(error)
-            print(
-                "CRITICAL: These errors will cause the document to appear corrupt. "
-                + "Broken references MUST be fixed, "
-                + "and unreferenced files MUST be referenced or removed."
-            )
-            return False
-        else:
-            if self.verbose:
-                print(
-                    "PASSED - All references are valid and all files are properly referenced"
+                unref_rel_path = self._relative(unref_file)
+                errors.append(
+                    Issue(
+                        unref_rel_path,
+                        None,
+                        "Unreferenced file",
+                        text=f"Unreferenced file: {unref_rel_path}",
+                    )
                 )
-            return True
+
+        return errors
 
     def validate_all_relationship_ids(self):
         """
         Validate that all r:id attributes in XML files reference existing IDs
         in their corresponding .rels files, and optionally validate relationship types.
         """
-        import lxml.etree
-
         errors = []
 
         # Process each XML file that might contain r:id references
@@ -402,82 +600,24 @@ class BaseSchemaValidator:
 
             # Determine the corresponding .rels file
             # For dir/file.xml, it's dir/_rels/file.xml.rels
-            rels_dir = xml_file.parent / "_rels"
-            rels_file = rels_dir / f"{xml_file.name}.rels"
+            rels_file = self.index.rels_file_for(xml_file)
 
             # Skip if there's no corresponding .rels file (that's okay)
-            if not rels_file.exists():
+            if not self.index.is_part(rels_file):
                 continue
 
-            try:
-                # Parse the .rels file to get valid relationship IDs and their types
-                rels_root = lxml.etree.parse(str(rels_file)).getroot()
-                rid_to_type = {}
-
-                for rel in rels_root.findall(
-                    f".//{{{self.PACKAGE_RELATIONSHIPS_NAMESPACE}}}Relationship"
-                ):
-                    rid = rel.get("Id")
-                    rel_type = rel.get("Type", "")
-                    if rid:
-                        # Check for duplicate rIds
-                        if rid in rid_to_type:
-                            rels_rel_path = rels_file.relative_to(self.unpacked_dir)
-                            errors.append(
-                                f"  {rels_rel_path}: Line {rel.sourceline}: "
-                                f"Duplicate relationship ID '{rid}' (IDs must be unique)"
-                            )
-                        # Extract just the type name from the full URL
-                        type_name = (
-                            rel_type.split("/")[-1] if "/" in rel_type else rel_type
-                        )
-                        rid_to_type[rid] = type_name
-
-                # Parse the XML file to find all r:id references
-                xml_root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all elements with r:id attributes
-                for elem in xml_root.iter():
-                    # Check for r:id attribute (relationship ID)
-                    rid_attr = elem.get(f"{{{self.OFFICE_RELATIONSHIPS_NAMESPACE}}}id")
-                    if rid_attr:
-                        xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                        elem_name = (
-                            elem.tag.split("}")[-1] if "}" in elem.tag else elem.tag
-                        )
-
-                        # Check if the ID exists
-                        if rid_attr not in rid_to_type:
-                            errors.append(
-                                f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                f"<{elem_name}> references non-existent relationship '{rid_attr}' "
-                                f"(valid IDs: {', '.join(sorted(rid_to_type.keys())[:5])}{'...' if len(rid_to_type) > 5 else ''})"
-                            )
-                        # Check if we have type expectations for this element
-                        elif self.ELEMENT_RELATIONSHIP_TYPES:
-                            expected_type = self._get_expected_relationship_type(
-                                elem_name
-                            )
-                            if expected_type:
-                                actual_type = rid_to_type[rid_attr]
-                                # Check if the actual type matches or contains the expected type
-                                if expected_type not in actual_type.lower():
-                                    errors.append(
-                                        f"  {xml_rel_path}: Line {elem.sourceline}: "
-                                        f"<{elem_name}> references '{rid_attr}' which points to '{actual_type}' "
-                                        f"but should point to a '{expected_type}' relationship"
-                                    )
-
-            except Exception as e:
-                xml_rel_path = xml_file.relative_to(self.unpacked_dir)
-                errors.append(f"  Error processing {xml_rel_path}: {e}")
+            errors.extend(
+                self._visitor_result(
+                    "relationship_ids", xml_file, depends_on=[rels_file]
+                )
+            )
 
         if errors:
-            print(f"FAILED - Found {len(errors)} relationship ID reference errors:")
-            for error in errors:
-                print(error)
-            print("\nThese ID mismatches will cause the document to appear corrupt!")
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} relationship ID reference errors:",
+                errors,
+                footer="\nThese ID mismatches will cause the document to appear corrupt!",
+            )
         else:
             if self.verbose:
                 print("PASSED - All relationship ID references are valid")
@@ -521,35 +661,63 @@ class BaseSchemaValidator:
 
     def validate_content_types(self):
         """Validate that all content files are properly declared in [Content_Types].xml."""
-        errors = []
-
         # Find [Content_Types].xml file
         content_types_file = self.unpacked_dir / "[Content_Types].xml"
-        if not content_types_file.exists():
-            print("FAILED - [Content_Types].xml file not found")
-            return False
+        if not self.index.is_part(content_types_file):
+            return self._fail(
+                "FAILED - [Content_Types].xml file not found",
+                [Issue("[Content_Types].xml", None, "File not found")],
+                lines=[],
+            )
 
-        try:
-            # Parse and get all declared parts and extensions
-            root = lxml.etree.parse(str(content_types_file)).getroot()
-            declared_parts = set()
-            declared_extensions = set()
-
-            # Get Override declarations (specific files)
-            for override in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"
-            ):
-                part_name = override.get("PartName")
-                if part_name is not None:
-                    declared_parts.add(part_name.lstrip("/"))
+        # Root element name of every content part (None if unparseable)
+        root_names = {}
+        for xml_file in self.xml_files:
+            path_str = str(xml_file.relative_to(self.unpacked_dir)).replace("\\", "/")
 
-            # Get Default declarations (by extension)
-            for default in root.findall(
-                f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"
+            # Skip non-content files
+            if any(
+                skip in path_str
+                for skip in [".rels", "[Content_Types]", "docProps/", "_rels/"]
             ):
-                extension = default.get("Extension")
-                if extension is not None:
-                    declared_extensions.add(extension.lower())
+                continue
+
+            root_names[path_str] = self._part_result(
+                "root_name", xml_file, self._root_name
+            )
+
+        errors = self._package_result(
+            "content_types",
+            lambda: self._content_type_errors(content_types_file, root_names),
+            extra=root_names,
+        )
+
+        if errors:
+            return self._fail(
+                f"FAILED - Found {len(errors)} content type declaration errors:", errors
+            )
+        else:
+            if self.verbose:
+                print(
+                    "PASSED - All content files are properly declared in [Content_Types].xml"
+                )
+            return True
+
+    def _root_name(self, xml_file):
+        """Return the local name of a file's root element, or None if unparseable."""
+        try:
+            root_tag = self.parts.shallow_root(xml_file).tag
+        except Exception:
+            return None
+        return root_tag.split("}")[-1] if "}" in root_tag else root_tag
+
+    def _content_type_errors(self, content_types_file, root_names):
+        """Return parts and media files missing from [Content_Types].xml."""
+        errors = []
+
+        try:
+            # Declared parts and extensions
+            declared_parts, declared_extensions = self.index.content_types()
 
             # Root elements that require content type declaration
             declarable_roots = {
@@ -575,34 +743,20 @@ class BaseSchemaValidator:
                 "emf": "image/x-emf",
             }
 
-            # Get all files in the unpacked directory
-            all_files = list(self.unpacked_dir.rglob("*"))
-            all_files = [f for f in all_files if f.is_file()]
+            # Get all files in the package
+            all_files = self.index.files
 
             # Check all XML files for Override declarations
-            for xml_file in self.xml_files:
-                path_str = str(xml_file.relative_to(self.unpacked_dir)).replace(
-                    "\\", "/"
-                )
-
-                # Skip non-content files
-                if any(
-                    skip in path_str
-                    for skip in [".rels", "[Content_Types]", "docProps/", "_rels/"]
-                ):
-                    continue
-
-                try:
-                    root_tag = lxml.etree.parse(str(xml_file)).getroot().tag
-                    root_name = root_tag.split("}")[-1] if "}" in root_tag else root_tag
-
-                    if root_name in declarable_roots and path_str not in declared_parts:
-                        errors.append(
-                            f"  {path_str}: File with <{root_name}> root not declared in [Content_Types].xml"
+            for path_str, root_name in root_names.items():
+                # Unparseable files have no root name and are skipped
+                if root_name in declarable_roots and path_str not in declared_parts:
+                    errors.append(
+                        Issue(
+                            path_str,
+                            None,
+                            f"File with <{root_name}> root not declared in [Content_Types].xml",
                         )
-
-                except Exception:
-                    continue  # Skip unparseable files
+                    )
 
             # Check all non-XML files for Default extension declarations
             for file_path in all_files:
@@ -618,25 +772,25 @@ class BaseSchemaValidator:
                 if extension and extension not in declared_extensions:
                     # Check if it's a known media extension that should be declared
                     if extension in media_extensions:
-                        relative_path = file_path.relative_to(self.unpacked_dir)
                         errors.append(
-                            f'  {relative_path}: File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>'
+                            Issue(
+                                self._relative(file_path),
+                                None,
+                                f'File with extension \'{extension}\' not declared in [Content_Types].xml - should add: <Default Extension="{extension}" ContentType="{media_extensions[extension]}"/>',
+                            )
                         )
 
         except Exception as e:
-            errors.append(f"  Error parsing [Content_Types].xml: {e}")
-
-        if errors:
-            print(f"FAILED - Found {len(errors)} content type declaration errors:")
-            for error in errors:
-                print(error)
-            return False
-        else:
-            if self.verbose:
-                print(
-                    "PASSED - All content files are properly declared in [Content_Types].xml"
+            errors.append(
+                Issue(
+                    "[Content_Types].xml",
+                    None,
+                    f"Error parsing: {e}",
+                    text=f"Error parsing [Content_Types].xml: {e}",
                 )
-            return True
+            )
+
+        return errors
 
     def validate_file_against_xsd(self, xml_file, verbose=False):
         """Validate a single XML file against XSD schema, comparing with original.
@@ -687,16 +841,18 @@ class BaseSchemaValidator:
 
     def validate_against_xsd(self):
         """Validate XML files against XSD schemas, showing only new errors compared to original."""
-        new_errors = []
+        issues = []
+        lines = []
+        invalid_count = 0
         original_error_count = 0
         valid_count = 0
         skipped_count = 0
 
+        results = self._xsd_results()
+
         for xml_file in self.xml_files:
             relative_path = str(xml_file.relative_to(self.unpacked_dir))
-            is_valid, new_file_errors = self.validate_file_against_xsd(
-                xml_file, verbose=False
-            )
+            is_valid, new_file_errors = results[xml_file]
 
             if is_valid is None:
                 skipped_count += 1
@@ -710,11 +866,19 @@ class BaseSchemaValidator:
                 valid_count += 1
                 continue
 
-            # Has new errors
-            new_errors.append(f"  {relative_path}: {len(new_file_errors)} new error(s)")
-            for error in list(new_file_errors)[:3]:  # Show first 3 errors
-                new_errors.append(
-                    f"    - {error[:250]}..." if len(error) > 250 else f"    - {error}"
+            # Has new errors; every one is an issue, the first 3 are shown
+            invalid_count += 1
+            file_issues = [
+                Issue(relative_path, None, error) for error in new_file_errors
+            ]
+            issues.extend(file_issues)
+            lines.append(f"  {relative_path}: {len(file_issues)} new error(s)")
+            for issue in file_issues[:3]:
+                message = issue.message
+                lines.append(
+                    f"    - {message[:250]}..."
+                    if len(message) > 250
+                    else f"    - {message}"
                 )
 
         # Print summary
@@ -724,20 +888,85 @@ class BaseSchemaValidator:
             print(f"  - Skipped (no schema): {skipped_count}")
             if original_error_count:
                 print(f"  - With original errors (ignored): {original_error_count}")
-            print(
-                f"  - With NEW errors: {len(new_errors) > 0 and len([e for e in new_errors if not e.startswith('    ')]) or 0}"
-            )
+            print(f"  - With NEW errors: {invalid_count}")
 
-        if new_errors:
-            print("\nFAILED - Found NEW validation errors:")
-            for error in new_errors:
-                print(error)
-            return False
+        if issues:
+            return self._fail(
+                "\nFAILED - Found NEW validation errors:", issues, lines=lines
+            )
         else:
             if self.verbose:
                 print("\nPASSED - No new XSD validation errors introduced")
             return True
 
+    def _xsd_results(self):
+        """Return {xml_file: [is_valid, new_errors]} for every XML file.
+
+        With jobs > 1, files that need schema validation are spread across a
+        process pool. Results are collected in file order, so the report is
+        the same as in serial mode.
+        """
+        computed = {}
+        if self.jobs > 1:
+            pending = [
+                xml_file
+                for xml_file in self.xml_files
+                if self._get_schema_path(xml_file)
+                and not self._has_part_result(
+                    "xsd", xml_file, extra=self._schema_digest(xml_file)
+                )
+            ]
+            if len(pending) > 1:
+                computed = dict(zip(pending, self._xsd_results_in_pool(pending)))
+
+        def compute(xml_file):
+            if xml_file in computed:
+                return computed[xml_file]
+            return self._xsd_result(xml_file)
+
+        return {
+            xml_file: self._part_result(
+                "xsd", xml_file, compute, extra=self._schema_digest(xml_file)
+            )
+            for xml_file in self.xml_files
+        }
+
+    def _schema_digest(self, xml_file):
+        """Return the digest of the schemas xml_file is validated against in
+        incremental mode (see SchemaBundleStore.digest()), so that stored XSD
+        results are not reused after a schema changes; None otherwise.
+        """
+        if self.incremental is None:
+            return None
+        schema_path = self._get_schema_path(xml_file)
+        return SCHEMA_BUNDLES.digest(schema_path) if schema_path else None
+
+    def _xsd_results_in_pool(self, xml_files):
+        """Validate xml_files in worker processes, returning results in the same order."""
+        workers = min(self.jobs, len(xml_files))
+        self.pool_stats = (len(xml_files), workers)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_xsd_worker,
+            initargs=(
+                type(self),
+                self.unpacked_dir,
+                self.original_file,
+                self.baseline_cache.enabled,
+                self.baseline_cache.directory,
+            ),
+        ) as pool:
+            chunksize = max(1, len(xml_files) // (workers * 4))
+            results = list(pool.map(_xsd_worker, xml_files, chunksize=chunksize))
+        self.worker_bytes_parsed += sum(bytes_parsed for _, bytes_parsed in results)
+        return [result for result, _ in results]
+
+    def _xsd_result(self, xml_file):
+        """Return [is_valid, new_errors] for a single file (see validate_file_against_xsd)."""
+        is_valid, new_errors = self.validate_file_against_xsd(xml_file, verbose=False)
+        # Sorted so that the errors shown do not depend on set ordering
+        return [is_valid, sorted(new_errors)]
+
     def _get_schema_path(self, xml_file):
         """Determine the appropriate schema path for an XML file."""
         # Check exact filename match
@@ -762,66 +991,69 @@ class BaseSchemaValidator:
 
         return None
 
-    def _clean_ignorable_namespaces(self, xml_doc):
-        """Remove attributes and elements not in allowed namespaces."""
-        # Create a clean copy
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        # Remove attributes not in allowed namespaces
-        for elem in xml_copy.iter():
-            attrs_to_remove = []
-
-            for attr in elem.attrib:
-                # Check if attribute is from a namespace other than allowed ones
-                if "{" in attr:
-                    ns = attr.split("}")[0][1:]
-                    if ns not in self.OOXML_NAMESPACES:
-                        attrs_to_remove.append(attr)
-
-            # Remove collected attributes
-            for attr in attrs_to_remove:
-                del elem.attrib[attr]
+    # Template tags ({{ ... }}) are placeholders for content replacement
+    TEMPLATE_TAG_PATTERN = re.compile(r"\{\{[^}]*\}\}")
+
+    def _prepare_for_xsd(self, xml_doc, relative_path):
+        """Return a copy of xml_doc prepared for XSD validation, in a single pass.
 
-        # Remove elements not in allowed namespaces
-        self._remove_ignorable_elements(xml_copy)
+        - Template tags are removed from text and tails, except in w:t elements.
+        - mc:Ignorable is removed from the root element.
+        - In main content folders (word/, ppt/, xl/), attributes and elements
+          outside the OOXML namespaces are removed.
 
-        return lxml.etree.ElementTree(xml_copy)
+        The document itself is not modified.
+        """
+        root = copy.deepcopy(xml_doc.getroot())
 
-    def _remove_ignorable_elements(self, root):
-        """Recursively remove all elements not in allowed namespaces."""
-        elements_to_remove = []
+        # Remove mc:Ignorable attribute from root
+        root.attrib.pop(f"{{{self.MC_NAMESPACE}}}Ignorable", None)
 
-        # Find elements to remove
-        for elem in list(root):
-            # Skip non-element nodes (comments, processing instructions, etc.)
-            if not hasattr(elem, "tag") or callable(elem.tag):
+        clean_namespaces = (
+            relative_path.parts and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
+        )
+        allowed = self.OOXML_NAMESPACES
+        template = self.TEMPLATE_TAG_PATTERN
+        foreign_elements = []
+
+        for elem in root.iter():
+            tag = elem.tag
+            # Skip comments and processing instructions
+            if not isinstance(tag, str):
                 continue
 
-            tag_str = str(elem.tag)
-            if tag_str.startswith("{"):
-                ns = tag_str.split("}")[0][1:]
-                if ns not in self.OOXML_NAMESPACES:
-                    elements_to_remove.append(elem)
-                    continue
+            # Strip template tags, leaving w:t elements (and their tails) alone
+            if not (tag.endswith("}t") or tag == "t"):
+                if elem.text and "{{" in elem.text:
+                    elem.text = template.sub("", elem.text)
+                if elem.tail and "{{" in elem.tail:
+                    elem.tail = template.sub("", elem.tail)
 
-            # Recursively clean child elements
-            self._remove_ignorable_elements(elem)
+            if not clean_namespaces:
+                continue
 
-        # Remove collected elements
-        for elem in elements_to_remove:
-            root.remove(elem)
+            # Remove attributes not in allowed namespaces
+            for attr in [
+                attr
+                for attr in elem.attrib
+                if attr.startswith("{") and attr[1:].split("}")[0] not in allowed
+            ]:
+                del elem.attrib[attr]
 
-    def _preprocess_for_mc_ignorable(self, xml_doc):
-        """Preprocess XML to handle mc:Ignorable attribute properly."""
-        # Remove mc:Ignorable attributes before validation
-        root = xml_doc.getroot()
+            # Collect elements (below the root) not in allowed namespaces
+            if (
+                elem is not root
+                and tag.startswith("{")
+                and tag[1:].split("}")[0] not in allowed
+            ):
+                foreign_elements.append(elem)
 
-        # Remove mc:Ignorable attribute from root
-        if f"{{{self.MC_NAMESPACE}}}Ignorable" in root.attrib:
-            del root.attrib[f"{{{self.MC_NAMESPACE}}}Ignorable"]
+        # Outer elements come first; removing one takes its subtree (and tail)
+        # with it, so later removals inside it have no further effect
+        for elem in foreign_elements:
+            elem.getparent().remove(elem)
 
-        return xml_doc
+        return lxml.etree.ElementTree(root)
 
     def _validate_single_file_xsd(self, xml_file, base_path):
         """Validate a single XML file against XSD schema. Returns (is_valid, errors_set)."""
@@ -830,28 +1062,24 @@ class BaseSchemaValidator:
             return None, None  # Skip file
 
         try:
-            # Load schema
-            with open(schema_path, "rb") as xsd_file:
-                parser = lxml.etree.XMLParser()
-                xsd_doc = lxml.etree.parse(
-                    xsd_file, parser=parser, base_url=str(schema_path)
-                )
-                schema = lxml.etree.XMLSchema(xsd_doc)
+            xml_doc = self.parts.tree(xml_file)
+        except Exception as e:
+            return False, {str(e)}
 
-            # Load and preprocess XML
-            with open(xml_file, "r") as f:
-                xml_doc = lxml.etree.parse(f)
+        return self._validate_xsd_document(
+            xml_doc, schema_path, xml_file.relative_to(base_path)
+        )
 
-            xml_doc, _ = self._remove_template_tags_from_text_nodes(xml_doc)
-            xml_doc = self._preprocess_for_mc_ignorable(xml_doc)
+    def _validate_xsd_document(self, xml_doc, schema_path, relative_path):
+        """Validate a parsed XML document against XSD schema. Returns (is_valid, errors_set).
 
-            # Clean ignorable namespaces if needed
-            relative_path = xml_file.relative_to(base_path)
-            if (
-                relative_path.parts
-                and relative_path.parts[0] in self.MAIN_CONTENT_FOLDERS
-            ):
-                xml_doc = self._clean_ignorable_namespaces(xml_doc)
+        The document is not modified; preprocessing works on a copy.
+        """
+        try:
+            # Load schema (compiled once per process)
+            schema = self.schema_cache.get(schema_path)
+
+            xml_doc = self._prepare_for_xsd(xml_doc, relative_path)
 
             # Validate
             if schema.validate(xml_doc):
@@ -875,76 +1103,200 @@ class BaseSchemaValidator:
         Returns:
             set: Set of error messages from the original file
         """
-        import tempfile
-        import zipfile
-
         # Resolve both paths to handle symlinks (e.g., /var vs /private/var on macOS)
         xml_file = Path(xml_file).resolve()
         unpacked_dir = self.unpacked_dir.resolve()
         relative_path = xml_file.relative_to(unpacked_dir)
+        part_name = relative_path.as_posix()
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        baseline = self.baseline
+        if not baseline.has_part(part_name):
+            # File didn't exist in original, so no original errors
+            return set()
 
-            # Extract original file
-            with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                zip_ref.extractall(temp_path)
+        schema_path = self._get_schema_path(relative_path)
+        if not schema_path:
+            return set()
+
+        # Each part of the original is validated at most once, and its
+        # errors are remembered on disk for later runs against the same file
+        key = (part_name, str(schema_path))
+        if key not in baseline.xsd_errors:
+            schema_digest = SCHEMA_BUNDLES.digest(schema_path)
+            errors = self.baseline_cache.get(
+                baseline.content_hash, part_name, schema_digest
+            )
+            if errors is None:
+                try:
+                    xml_doc = baseline.tree(part_name)
+                except Exception as e:
+                    errors = {str(e)}
+                else:
+                    _, errors = self._validate_xsd_document(
+                        xml_doc, schema_path, relative_path
+                    )
+                errors = errors or set()
+                self.baseline_cache.put(
+                    baseline.content_hash, part_name, schema_digest, errors
+                )
+            baseline.xsd_errors[key] = errors
+
+        return baseline.xsd_errors[key]
+
+
+class UniqueIdVisitor(PartVisitor):
+    """Check file-scoped ID uniqueness and collect globally scoped IDs.
+
+    The result lists, in document order, error messages for file-scoped
+    duplicates and [id, line, tag] entries for IDs that must be globally
+    unique. Content inside mc:AlternateContent is not checked.
+    """
+
+    skip = (f"{{{BaseSchemaValidator.MC_NAMESPACE}}}AlternateContent",)
+
+    def __init__(self, validator, xml_file):
+        super().__init__(validator, xml_file)
+        self.requirements = validator.UNIQUE_ID_REQUIREMENTS
+        self.file_ids = {}  # Track IDs that must be unique within this file
+
+    def wants(self, tag):
+        # Only element types with ID uniqueness requirements
+        return local_name(tag).lower() in self.requirements
+
+    def start(self, elem, name):
+        tag = name.lower()
+
+        # Check if this element type has ID uniqueness requirements
+        if tag not in self.requirements:
+            return
+        attr_name, scope = self.requirements[tag]
+
+        # Look for the specified attribute
+        id_value = None
+        for attr, value in elem.attrib.items():
+            if local_name(attr).lower() == attr_name:
+                id_value = value
+                break
+
+        if id_value is None:
+            return
+        if scope == "global":
+            self.errors.append([id_value, elem.sourceline, tag])
+        elif scope == "file":
+            # Check file-level uniqueness
+            ids = self.file_ids.setdefault((tag, attr_name), {})
+            if id_value in ids:
+                self.errors.append(
+                    Issue(
+                        str(self.relative_path),
+                        elem.sourceline,
+                        f"Duplicate {attr_name}='{id_value}' in <{tag}> "
+                        f"(first occurrence at line {ids[id_value]})",
+                    )
+                )
+            else:
+                ids[id_value] = elem.sourceline
 
-            # Find corresponding file in original
-            original_xml_file = temp_path / relative_path
 
-            if not original_xml_file.exists():
-                # File didn't exist in original, so no original errors
-                return set()
+class RelationshipIdVisitor(PartVisitor):
+    """Check r:id references in a part against its .rels file."""
 
-            # Validate the specific file in original
-            is_valid, errors = self._validate_single_file_xsd(
-                original_xml_file, temp_path
-            )
-            return errors if errors else set()
+    def __init__(self, validator, xml_file, rels_file):
+        super().__init__(validator, xml_file)
+        self.rels_file = rels_file
 
-    def _remove_template_tags_from_text_nodes(self, xml_doc):
-        """Remove template tags from XML text nodes and collect warnings.
+    def begin(self):
+        validator = self.validator
+        self.rid_attr = f"{{{validator.OFFICE_RELATIONSHIPS_NAMESPACE}}}id"
 
-        Template tags follow the pattern {{ ... }} and are used as placeholders
-        for content replacement. They should be removed from text content before
-        XSD validation while preserving XML structure.
+        # Valid relationship IDs and their types
+        self.rid_to_type = {}
 
-        Returns:
-            tuple: (cleaned_xml_doc, warnings_list)
-        """
-        warnings = []
-        template_pattern = re.compile(r"\{\{[^}]*\}\}")
-
-        # Create a copy of the document to avoid modifying the original
-        xml_string = lxml.etree.tostring(xml_doc, encoding="unicode")
-        xml_copy = lxml.etree.fromstring(xml_string)
-
-        def process_text_content(text, content_type):
-            if not text:
-                return text
-            matches = list(template_pattern.finditer(text))
-            if matches:
-                for match in matches:
-                    warnings.append(
-                        f"Found template tag in {content_type}: {match.group()}"
+        for rel in validator.index.relationships(self.rels_file):
+            rid = rel.id
+            if rid:
+                # Check for duplicate rIds
+                if rid in self.rid_to_type:
+                    self.errors.append(
+                        Issue(
+                            validator._relative(self.rels_file),
+                            rel.sourceline,
+                            f"Duplicate relationship ID '{rid}' (IDs must be unique)",
+                        )
+                    )
+                # Extract just the type name from the full URL
+                rel_type = rel.type
+                type_name = rel_type.split("/")[-1] if "/" in rel_type else rel_type
+                self.rid_to_type[rid] = type_name
+
+        rids = sorted(self.rid_to_type.keys())
+        self.valid_ids = f"{', '.join(rids[:5])}{'...' if len(rids) > 5 else ''}"
+
+    def start(self, elem, name):
+        # Check for r:id attribute (relationship ID)
+        rid_attr = elem.get(self.rid_attr)
+        if not rid_attr:
+            return
+
+        # Check if the ID exists
+        if rid_attr not in self.rid_to_type:
+            self.errors.append(
+                Issue(
+                    str(self.relative_path),
+                    elem.sourceline,
+                    f"<{name}> references non-existent relationship '{rid_attr}' "
+                    f"(valid IDs: {self.valid_ids})",
+                )
+            )
+        # Check if we have type expectations for this element
+        elif self.validator.ELEMENT_RELATIONSHIP_TYPES:
+            expected_type = self.validator._get_expected_relationship_type(name)
+            if expected_type:
+                actual_type = self.rid_to_type[rid_attr]
+                # Check if the actual type matches or contains the expected type
+                if expected_type not in actual_type.lower():
+                    self.errors.append(
+                        Issue(
+                            str(self.relative_path),
+                            elem.sourceline,
+                            f"<{name}> references '{rid_attr}' which points to '{actual_type}' "
+                            f"but should point to a '{expected_type}' relationship",
+                        )
                     )
-                return template_pattern.sub("", text)
-            return text
 
-        # Process all text nodes in the document
-        for elem in xml_copy.iter():
-            # Skip processing if this is a w:t element
-            if not hasattr(elem, "tag") or callable(elem.tag):
-                continue
-            tag_str = str(elem.tag)
-            if tag_str.endswith("}t") or tag_str == "t":
-                continue
+    def fail(self, error):
+        self.failed = True
+        self.errors.append(
+            Issue(
+                str(self.relative_path),
+                None,
+                f"Error processing: {error}",
+                text=f"Error processing {self.relative_path}: {error}",
+            )
+        )
+
+
+# Validator owned by each XSD worker process; it keeps its own parsed parts,
+# compiled schemas and view of the original package
+_worker_validator = None
+
+
+def _init_xsd_worker(
+    validator_class, unpacked_dir, original_file, cache_enabled, cache_directory
+):
+    global _worker_validator
+    # Follow the parent's baseline cache settings rather than the environment,
+    # since --no-cache and the server's per-request no_cache only change them
+    # in the parent
+    validator_class.baseline_cache.enabled = cache_enabled
+    validator_class.baseline_cache.directory = cache_directory
+    _worker_validator = validator_class(unpacked_dir, original_file)
 
-            elem.text = process_text_content(elem.text, "text content")
-            elem.tail = process_text_content(elem.tail, "tail content")
 
-        return lxml.etree.ElementTree(xml_copy), warnings
+def _xsd_worker(xml_file):
+    bytes_before = _worker_validator._bytes_parsed()
+    result = _worker_validator._xsd_result(xml_file)
+    return result, _worker_validator._bytes_parsed() - bytes_before
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+"""
+In-memory view of the original package that validation results are compared against.
+"""
+
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+from pathlib import Path
+
+import lxml.etree
+
+from .cache import file_sha256
+
+
+class OriginalPackage:
+    """Read parts of the original package straight from the zip, on demand.
+
+    The archive is opened once; each part is only read (and parsed) when a
+    check asks for it, and parsed trees are kept for reuse. Trees returned by
+    tree() and root() are shared and must be treated as read-only.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path, "r")
+        self._names = set(self._zip.namelist())
+        self._trees = {}
+        self._lock = threading.Lock()
+        self._content_hash = None
+        self.bytes_parsed = 0
+
+        # Memoized XSD error sets, keyed by (part name, schema path)
+        self.xsd_errors = {}
+
+    @property
+    def content_hash(self):
+        """SHA-256 of the original package file, computed on first use."""
+        if self._content_hash is None:
+            self._content_hash = file_sha256(self.path)
+        return self._content_hash
+
+    def has_part(self, name):
+        """Return True if the original package contains the named part."""
+        return name in self._names
+
+    def read(self, name):
+        """Return the raw bytes of a part (raises KeyError if it is missing)."""
+        with self._lock:
+            return self._zip.read(name)
+
+    def tree(self, name):
+        """Return the parsed lxml ElementTree of a part (read-only)."""
+        if name not in self._trees:
+            data = self.read(name)
+            self.bytes_parsed += len(data)
+            self._trees[name] = lxml.etree.parse(io.BytesIO(data))
+        return self._trees[name]
+
+    def root(self, name):
+        """Return the root element of a parsed part (read-only)."""
+        return self.tree(name).getroot()
+
+    def close(self):
+        """Close the underlying archive."""
+        self._zip.close()
+
+
+# Recently used original packages, shared by all validators in the process
+_MAX_OPEN_BASELINES = 8
+_baselines = OrderedDict()
+_baselines_lock = threading.Lock()
+
+
+def load_baseline(original_file):
+    """Return the shared OriginalPackage for original_file.
+
+    Packages are cached by path, size and modification time, so validators
+    running against the same original (schema, redlining, paragraph counts)
+    share one open archive and its parsed parts.
+    """
+    path = Path(original_file).resolve()
+    stat = path.stat()
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+
+    with _baselines_lock:
+        if key in _baselines:
+            _baselines.move_to_end(key)
+            return _baselines[key]
+
+        baseline = OriginalPackage(path)
+        _baselines[key] = baseline
+        while len(_baselines) > _MAX_OPEN_BASELINES:
+            _, evicted = _baselines.popitem(last=False)
+            evicted.close()
+        return baseline
@@ -0,0 +1,139 @@
+"""
+Validate many (document, original) pairs across a pool of worker processes.
+"""
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .runner import run_request
+
+DOCUMENT_EXTENSIONS = (".docx", ".pptx", ".xlsx")
+
+
+def read_pairs(source, original=None):
+    """Return the (document, original) pairs listed by source.
+
+    source is either a JSON-lines manifest with one
+    {"document": ..., "original": ...} object per line (relative paths are
+    relative to the manifest), or a directory of packed documents. In a
+    directory, each NAME.docx is paired with original if given (which is
+    skipped if it sits in the directory), otherwise with its sibling
+    NAME.original.docx (likewise for .pptx and .xlsx).
+    """
+    source = Path(source)
+    pairs = []
+
+    if source.is_dir():
+        original_path = None if original is None else Path(original).resolve()
+        for document in sorted(source.iterdir()):
+            if document.suffix.lower() not in DOCUMENT_EXTENSIONS:
+                continue
+            if document.stem.endswith(".original"):
+                continue
+            if document.resolve() == original_path:
+                continue
+            if original is not None:
+                pairs.append((document, Path(original)))
+            else:
+                sibling = document.with_name(
+                    f"{document.stem}.original{document.suffix}"
+                )
+                pairs.append((document, sibling))
+        return pairs
+
+    with open(source, encoding="utf-8") as manifest:
+        for line_num, line in enumerate(manifest, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                document = source.parent / entry["document"]
+                pair_original = entry.get("original", original)
+                if pair_original is None:
+                    raise KeyError("original")
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{source}: Line {line_num}: Invalid entry: {e}")
+            pairs.append((document, source.parent / pair_original))
+    return pairs
+
+
+def _validate_pair(request):
+    """Worker: validate one pair and add its timing to the response."""
+    start = time.perf_counter()
+    response = run_request(request)
+    response["seconds"] = round(time.perf_counter() - start, 3)
+    return response
+
+
+def run_batch(pairs, output, workers=1, options=None):
+    """Validate pairs in workers processes, writing one JSON line per document.
+
+    Lines are written to the text stream output as documents finish, so their
+    order follows completion rather than the input; each carries the
+    position of its pair in "index". options holds the per-request options
+    of run_request() ("verbose", "incremental", "checks", "level",
+    "fail_fast", "format", "profile", "no_cache").
+    Every worker keeps its compiled schemas and opened originals for the
+    documents it validates next. Returns the number of documents that failed.
+    """
+    options = dict(options or {})
+    # Workers already run in parallel; nested XSD pools would oversubscribe
+    options["jobs"] = 1
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for index, (document, original) in enumerate(pairs):
+            result = {
+                "index": index,
+                "document": str(document),
+                "original": str(original),
+            }
+            missing = [str(p) for p in (document, original) if not Path(p).exists()]
+            if missing:
+                result.update(
+                    status="error",
+                    exit_code=1,
+                    seconds=0.0,
+                    stdout="",
+                    stderr=f"Error: {', '.join(missing)} not found\n",
+                )
+                failures += 1
+                _write_result(output, result)
+                continue
+
+            request = dict(
+                options,
+                document=str(Path(document).resolve()),
+                original=str(Path(original).resolve()),
+            )
+            futures[executor.submit(_validate_pair, request)] = result
+
+        for future in as_completed(futures):
+            result = futures[future]
+            try:
+                response = future.result()
+            except Exception as e:
+                # The worker process itself died (for example out of memory)
+                response = {
+                    "exit_code": 1,
+                    "seconds": 0.0,
+                    "stdout": "",
+                    "stderr": f"Error: Worker failed: {e}\n",
+                }
+                result["status"] = "error"
+            else:
+                result["status"] = "passed" if response["exit_code"] == 0 else "failed"
+            result.update(response)
+            if result["exit_code"] != 0:
+                failures += 1
+            _write_result(output, result)
+
+    return failures
+
+
+def _write_result(output, result):
+    output.write(json.dumps(result) + "\n")
+    output.flush()
@@ -0,0 +1,118 @@
+"""
+On-disk caches that persist validation work across runs.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+# Bump when a change to preprocessing or error reporting invalidates cached results
+CACHE_VERSION = 2
+
+
+def cache_dir():
+    """Return the root directory for persistent validation caches.
+
+    Defaults to ~/.cache/ooxml-validation (honouring XDG_CACHE_HOME) and can
+    be overridden with the OOXML_VALIDATION_CACHE_DIR environment variable.
+    """
+    override = os.environ.get("OOXML_VALIDATION_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ooxml-validation"
+
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path, data, default=None):
+    """Write data as JSON to path without ever leaving a partial file behind.
+
+    default is passed to json.dump() to serialize other objects.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=default)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+class BaselineErrorCache:
+    """Persistent store of XSD error sets found in original (baseline) parts.
+
+    Entries are content-addressed: the key combines the SHA-256 of the
+    original package, the part name and the digest of the schema's whole
+    import graph (see SchemaBundleStore.digest()), so an entry can never be
+    served for a different original or for a schema, or any schema it
+    imports, that has since changed. Each entry is its own small JSON file
+    in a directory per original package, so recording one never rewrites
+    the others.
+    """
+
+    def __init__(self, directory=None):
+        self._directory = Path(directory) if directory else None
+        self.enabled = os.environ.get("OOXML_VALIDATION_CACHE", "1") != "0"
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self):
+        return self._directory or cache_dir() / "baseline"
+
+    @directory.setter
+    def directory(self, directory):
+        self._directory = Path(directory) if directory else None
+
+    def get(self, original_hash, part_name, schema_digest):
+        """Return the cached error set, or None if it has not been recorded."""
+        if not self.enabled:
+            return None
+        try:
+            with open(
+                self._path(original_hash, part_name, schema_digest), encoding="utf-8"
+            ) as f:
+                errors = json.load(f)
+        except (OSError, ValueError):
+            errors = None
+        with self._lock:
+            if errors is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return set(errors)
+
+    def put(self, original_hash, part_name, schema_digest, errors):
+        """Record the error set of a baseline part and persist it."""
+        if not self.enabled:
+            return
+        try:
+            write_json_atomic(
+                self._path(original_hash, part_name, schema_digest), sorted(errors)
+            )
+        except OSError:
+            pass  # A read-only or full cache directory only costs speed
+
+    def _path(self, original_hash, part_name, schema_digest):
+        key = f"{part_name}|{schema_digest}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"v{CACHE_VERSION}-{original_hash}" / f"{digest}.json"
+
+
+# Shared by every validator in this process
+BASELINE_ERROR_CACHE = BaselineErrorCache()
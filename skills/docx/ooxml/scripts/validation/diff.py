@@ -0,0 +1,209 @@
+"""
+Word- and character-level text diffs in the format of git's --word-diff=plain.
+"""
+
+import re
+
+# Changed paragraphs longer than this (in characters) are diffed word by word
+CHARACTER_DIFF_LIMIT = 2000
+# Steps that aligning paragraphs and comparing their tokens may take in total;
+# changes left when it runs out are reported as whole removed and added text
+STEP_BUDGET = 1000000
+
+WORD_PATTERN = re.compile(r"\S+|\s+")
+
+
+def paragraph_diff(original_paragraphs, modified_paragraphs, budget=STEP_BUDGET):
+    """Return the differences between two lists of paragraphs, one change per line.
+
+    Within changed paragraphs, removed text is shown as [-text-] and added
+    text as {+text+}, as git diff --word-diff=plain -U0 does. Leading and
+    trailing paragraphs common to both lists are skipped and the rest are
+    aligned with Myers' algorithm. If aligning them would take more than
+    budget steps, they are shown whole as one removed and one added region.
+    Paragraphs are compared character by character up to
+    CHARACTER_DIFF_LIMIT characters, and word by word beyond it, also with
+    Myers' algorithm. Comparisons are charged to what is left of budget, and
+    a paragraph whose comparison would exceed it is shown whole instead.
+    Every step of the alignment and of the comparisons is charged to the one
+    budget, so apart from work linear in the length of the text, about
+    budget steps are spent on the whole diff. Returns "" if the lists are
+    equal.
+    """
+    # Only the paragraphs between the common prefix and suffix can differ
+    start = 0
+    limit = min(len(original_paragraphs), len(modified_paragraphs))
+    while start < limit and original_paragraphs[start] == modified_paragraphs[start]:
+        start += 1
+    end = 0
+    while (
+        end < limit - start
+        and original_paragraphs[-1 - end] == modified_paragraphs[-1 - end]
+    ):
+        end += 1
+    original_lines = original_paragraphs[start : len(original_paragraphs) - end]
+    modified_lines = modified_paragraphs[start : len(modified_paragraphs) - end]
+
+    edits, steps = _edit_script(original_lines, modified_lines, budget)
+    budget -= steps
+    if edits is None:
+        # Too costly to align: show everything in between as one replacement
+        blocks = [(["\n".join(original_lines)], ["\n".join(modified_lines)])]
+    else:
+        blocks = _changed_blocks(edits)
+
+    lines = []
+    for removed_lines, added_lines in blocks:
+        if len(removed_lines) == len(added_lines):
+            # Edited paragraphs: compare each with its counterpart
+            changes = zip(removed_lines, added_lines)
+        else:
+            changes = [("\n".join(removed_lines), "\n".join(added_lines))]
+
+        for removed, added in changes:
+            if max(len(removed), len(added)) <= CHARACTER_DIFF_LIMIT:
+                original_tokens, modified_tokens = removed, added
+            else:
+                original_tokens = WORD_PATTERN.findall(removed)
+                modified_tokens = WORD_PATTERN.findall(added)
+
+            hunk = None
+            if removed and added and budget > 0:
+                hunk, steps = _diff_tokens(original_tokens, modified_tokens, budget)
+                budget -= steps
+            if hunk is None:
+                hunk = _mark("[-", removed, "-]") + _mark("{+", added, "+}")
+            lines.extend(line for line in hunk.split("\n") if line.strip())
+
+    return "\n".join(lines)
+
+
+def _changed_blocks(edits):
+    """Return the runs of removed and added items in an edit script, as pairs of lists."""
+    blocks = []
+    removed, added = [], []
+    for op, item in edits:
+        if op == "=":
+            if removed or added:
+                blocks.append((removed, added))
+                removed, added = [], []
+        elif op == "-":
+            removed.append(item)
+        else:
+            added.append(item)
+    if removed or added:
+        blocks.append((removed, added))
+    return blocks
+
+
+def _diff_tokens(original_tokens, modified_tokens, budget):
+    """Return the marked-up modified text of one changed run of paragraphs.
+
+    Returns (text, steps), where steps is the number of comparison steps
+    spent, or (None, steps) if finding the differences would take more than
+    budget steps.
+    """
+    # Tokens common to both ends are copied without being compared again
+    start = 0
+    limit = min(len(original_tokens), len(modified_tokens))
+    while start < limit and original_tokens[start] == modified_tokens[start]:
+        start += 1
+    end = 0
+    while (
+        end < limit - start and original_tokens[-1 - end] == modified_tokens[-1 - end]
+    ):
+        end += 1
+    a = original_tokens[start : len(original_tokens) - end]
+    b = modified_tokens[start : len(modified_tokens) - end]
+
+    edits, steps = _edit_script(a, b, budget)
+    if edits is None:
+        return None, steps
+
+    parts = ["".join(original_tokens[:start])]
+    removed, added = [], []
+    for op, token in edits:
+        if op == "=":
+            if removed or added:
+                parts.append(
+                    _mark("[-", "".join(removed), "-]")
+                    + _mark("{+", "".join(added), "+}")
+                )
+                removed, added = [], []
+            parts.append(token)
+        elif op == "-":
+            removed.append(token)
+        else:
+            added.append(token)
+    if removed or added:
+        parts.append(
+            _mark("[-", "".join(removed), "-]") + _mark("{+", "".join(added), "+}")
+        )
+    parts.append("".join(original_tokens[len(original_tokens) - end :]))
+    return "".join(parts), steps
+
+
+def _edit_script(a, b, budget):
+    """Return the shortest edit script turning a into b, with Myers' algorithm.
+
+    The script is a list of ("=", token), ("-", token) and ("+", token)
+    pairs. Returns (script, steps), or (None, steps) once more than budget
+    steps have been spent without reaching the end of both sequences.
+    """
+    n, m = len(a), len(b)
+    # v[k] is the furthest x reached on diagonal k = x - y
+    v = {1: 0}
+    trace = []
+    steps = 0
+    for d in range(n + m + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            snake = x
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            steps += 1 + x - snake
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(a, b, trace), steps
+        steps += d
+        if steps > budget:
+            return None, steps
+    return _backtrack(a, b, trace), steps
+
+
+def _backtrack(a, b, trace):
+    """Recover the edit script from the diagonals saved by _edit_script."""
+    x, y = len(a), len(b)
+    edits = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            edits.append(("=", a[x]))
+        if d > 0:
+            if x == previous_x:
+                edits.append(("+", b[previous_y]))
+            else:
+                edits.append(("-", a[previous_x]))
+        x, y = previous_x, previous_y
+    edits.reverse()
+    return edits
+
+
+def _mark(start, text, end):
+    """Wrap each line of text in the markers, keeping its line breaks."""
+    return "\n".join(start + line + end if line else "" for line in text.split("\n"))
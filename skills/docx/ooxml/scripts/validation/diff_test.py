@@ -0,0 +1,85 @@
+import random
+import time
+import unittest
+
+from validation.diff import paragraph_diff
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the ooxml/scripts directory: python -m unittest validation.diff_test
+class TestParagraphDiff(unittest.TestCase):
+    def test_equal_paragraphs(self):
+        """Equal lists have no differences"""
+        self.assertEqual(paragraph_diff(["one", "two"], ["one", "two"]), "")
+
+    def test_character_changes(self):
+        """Short paragraphs are compared character by character"""
+        self.assertEqual(
+            paragraph_diff(["Hello world"], ["Hello brave world"]),
+            "Hello {+brave +}world",
+        )
+
+    def test_only_changed_paragraphs_are_shown(self):
+        """Common paragraphs are left out of the diff"""
+        self.assertEqual(paragraph_diff(["a", "b", "c"], ["a", "x", "c"]), "[-b-]{+x+}")
+
+    def test_removed_paragraph(self):
+        """A paragraph without a counterpart is shown whole"""
+        self.assertEqual(paragraph_diff(["a", "gone", "c"], ["a", "c"]), "[-gone-]")
+
+    def test_long_paragraphs_are_compared_by_word(self):
+        """Paragraphs longer than the character limit are compared word by word"""
+        words = ["word%d" % i for i in range(1000)]
+        modified = list(words)
+        modified[500] = "changed"
+        self.assertEqual(
+            paragraph_diff([" ".join(words)], [" ".join(modified)]),
+            " ".join(words[:500]) + " [-word500-]{+changed+} " + " ".join(words[501:]),
+        )
+
+    def test_exhausted_budget_shows_whole_paragraphs(self):
+        """Once the budget is spent, changed paragraphs are shown whole"""
+        self.assertEqual(
+            paragraph_diff(["The quick fox"], ["The slow fox"], budget=0),
+            "[-The quick fox-]{+The slow fox+}",
+        )
+
+    def test_pathological_character_diff_is_bounded(self):
+        """Repetitive paragraphs with few matches finish quickly"""
+        start = time.time()
+        diff = paragraph_diff(["word " * 400], ["drow " * 400])
+        self.assertLess(time.time() - start, 5)
+        self.assertTrue(diff)
+
+    def test_large_rewrite_is_bounded(self):
+        """Rewriting many paragraphs of thousands of words finishes quickly"""
+        original = [" ".join(["word"] * 12000)] * 5
+        modified = [" ".join(["drow", "word"] * 6000)] * 5
+        start = time.time()
+        diff = paragraph_diff(original, modified)
+        self.assertLess(time.time() - start, 5)
+        self.assertIn("{+drow", diff)
+
+    def test_repeated_short_paragraphs_are_bounded(self):
+        """Aligning many repeated, shuffled short paragraphs finishes quickly"""
+        cells = ["Yes", "No", "N/A", "1", "2"]
+        original = [cells[(i * 7) % 5] for i in range(12000)]
+        deleted = [paragraph for i, paragraph in enumerate(original) if i % 10]
+        shuffled = list(original)
+        random.Random(0).shuffle(shuffled)
+        for modified in (deleted, shuffled):
+            start = time.time()
+            diff = paragraph_diff(original, modified)
+            self.assertLess(time.time() - start, 5)
+            self.assertTrue(diff)
+
+    def test_unaligned_region_is_shown_whole(self):
+        """Paragraphs too costly to align are shown as one removed and added region"""
+        self.assertEqual(
+            paragraph_diff(["a", "b", "c", "d"], ["a", "x", "y", "d"], budget=0),
+            "[-b-]\n[-c-]{+x+}\n{+y+}",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,12 +3,11 @@ Validator for Word document XML files against XSD schemas.
 """
 
 import re
-import tempfile
-import zipfile
-
-import lxml.etree
 
 from .base import BaseSchemaValidator
+from .checks import CHEAP, EXPENSIVE, MODERATE
+from .results import Issue
+from .visitors import PartVisitor
 
 
 class DOCXSchemaValidator(BaseSchemaValidator):
@@ -21,53 +20,20 @@ class DOCXSchemaValidator(BaseSchemaValidator):
     # Start with empty mapping - add specific cases as we discover them
     ELEMENT_RELATIONSHIP_TYPES = {}
 
-    def validate(self):
-        """Run all validation checks and return True if all pass."""
-        # Test 0: XML well-formedness
-        if not self.validate_xml():
-            return False
-
-        # Test 1: Namespace declarations
-        all_valid = True
-        if not self.validate_namespaces():
-            all_valid = False
-
-        # Test 2: Unique IDs
-        if not self.validate_unique_ids():
-            all_valid = False
-
-        # Test 3: Relationship and file reference validation
-        if not self.validate_file_references():
-            all_valid = False
-
-        # Test 4: Content type declarations
-        if not self.validate_content_types():
-            all_valid = False
-
-        # Test 5: XSD schema validation
-        if not self.validate_against_xsd():
-            all_valid = False
-
-        # Test 6: Whitespace preservation
-        if not self.validate_whitespace_preservation():
-            all_valid = False
-
-        # Test 7: Deletion validation
-        if not self.validate_deletions():
-            all_valid = False
-
-        # Test 8: Insertion validation
-        if not self.validate_insertions():
-            all_valid = False
-
-        # Test 9: Relationship ID reference validation
-        if not self.validate_all_relationship_ids():
-            all_valid = False
-
-        # Count and compare paragraphs
-        self.compare_paragraph_counts()
-
-        return all_valid
+    # Checks in their order within each cost class
+    CHECKS = [
+        ("xml", CHEAP),
+        ("namespaces", CHEAP),
+        ("unique_ids", MODERATE),
+        ("file_references", CHEAP),
+        ("content_types", CHEAP),
+        ("against_xsd", EXPENSIVE),
+        ("whitespace_preservation", MODERATE),
+        ("deletions", MODERATE),
+        ("insertions", MODERATE),
+        ("all_relationship_ids", MODERATE),
+        ("paragraph_counts", EXPENSIVE),
+    ]
 
     def validate_whitespace_preservation(self):
         """
@@ -80,42 +46,13 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements
-                for elem in root.iter(f"{{{self.WORD_2006_NAMESPACE}}}t"):
-                    if elem.text:
-                        text = elem.text
-                        # Check if text starts or ends with whitespace
-                        if re.match(r"^\s.*", text) or re.match(r".*\s$", text):
-                            # Check if xml:space="preserve" attribute exists
-                            xml_space_attr = f"{{{self.XML_NAMESPACE}}}space"
-                            if (
-                                xml_space_attr not in elem.attrib
-                                or elem.attrib[xml_space_attr] != "preserve"
-                            ):
-                                # Show a preview of the text
-                                text_preview = (
-                                    repr(text)[:50] + "..."
-                                    if len(repr(text)) > 50
-                                    else repr(text)
-                                )
-                                errors.append(
-                                    f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                                    f"Line {elem.sourceline}: w:t element with whitespace missing xml:space='preserve': {text_preview}"
-                                )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+            errors.extend(self._visitor_result("whitespace", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} whitespace preservation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} whitespace preservation violations:",
+                errors,
+            )
         else:
             if self.verbose:
                 print("PASSED - All whitespace is properly preserved")
@@ -133,38 +70,12 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-
-                # Find all w:t elements that are descendants of w:del elements
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-                xpath_expression = ".//w:del//w:t"
-                problematic_t_elements = root.xpath(
-                    xpath_expression, namespaces=namespaces
-                )
-                for t_elem in problematic_t_elements:
-                    if t_elem.text:
-                        # Show a preview of the text
-                        text_preview = (
-                            repr(t_elem.text)[:50] + "..."
-                            if len(repr(t_elem.text)) > 50
-                            else repr(t_elem.text)
-                        )
-                        errors.append(
-                            f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                            f"Line {t_elem.sourceline}: <w:t> found within <w:del>: {text_preview}"
-                        )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+            errors.extend(self._visitor_result("deletions", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} deletion validation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} deletion validation violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - No w:t elements found within w:del elements")
@@ -179,13 +90,11 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
-            except Exception as e:
-                print(f"Error counting paragraphs in unpacked document: {e}")
+            result = self._visitor_result("paragraphs", xml_file)
+            if isinstance(result, str):
+                print(f"Error counting paragraphs in unpacked document: {result}")
+            else:
+                count = result
 
         return count
 
@@ -193,21 +102,16 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         """Count the number of paragraphs in the original docx file."""
         count = 0
 
-        try:
-            # Create temporary directory to unpack original
-            with tempfile.TemporaryDirectory() as temp_dir:
-                # Unpack original docx
-                with zipfile.ZipFile(self.original_file, "r") as zip_ref:
-                    zip_ref.extractall(temp_dir)
-
-                # Parse document.xml
-                doc_xml_path = temp_dir + "/word/document.xml"
-                root = lxml.etree.parse(doc_xml_path).getroot()
+        def count_original():
+            # Parse document.xml straight from the original package
+            root = self.baseline.root("word/document.xml")
 
-                # Count all w:p elements
-                paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
-                count = len(paragraphs)
+            # Count all w:p elements
+            paragraphs = root.findall(f".//{{{self.WORD_2006_NAMESPACE}}}p")
+            return len(paragraphs)
 
+        try:
+            count = self._baseline_result("paragraphs", count_original)
         except Exception as e:
             print(f"Error counting paragraphs in original document: {e}")
 
@@ -224,42 +128,32 @@ class DOCXSchemaValidator(BaseSchemaValidator):
             if xml_file.name != "document.xml":
                 continue
 
-            try:
-                root = lxml.etree.parse(str(xml_file)).getroot()
-                namespaces = {"w": self.WORD_2006_NAMESPACE}
-
-                # Find w:delText in w:ins that are NOT within w:del
-                invalid_elements = root.xpath(
-                    ".//w:ins//w:delText[not(ancestor::w:del)]",
-                    namespaces=namespaces
-                )
-
-                for elem in invalid_elements:
-                    text_preview = (
-                        repr(elem.text or "")[:50] + "..."
-                        if len(repr(elem.text or "")) > 50
-                        else repr(elem.text or "")
-                    )
-                    errors.append(
-                        f"  {xml_file.relative_to(self.unpacked_dir)}: "
-                        f"Line {elem.sourceline}: <w:delText> within <w:ins>: {text_preview}"
-                    )
-
-            except (lxml.etree.XMLSyntaxError, Exception) as e:
-                errors.append(
-                    f"  {xml_file.relative_to(self.unpacked_dir)}: Error: {e}"
-                )
+            errors.extend(self._visitor_result("insertions", xml_file))
 
         if errors:
-            print(f"FAILED - Found {len(errors)} insertion validation violations:")
-            for error in errors:
-                print(error)
-            return False
+            return self._fail(
+                f"FAILED - Found {len(errors)} insertion validation violations:", errors
+            )
         else:
             if self.verbose:
                 print("PASSED - No w:delText elements within w:ins elements")
             return True
 
+    def _part_visitors(self, xml_file):
+        """Add the tracked-change, whitespace and paragraph checks for document.xml."""
+        visitors = super()._part_visitors(xml_file)
+        if xml_file.name == "document.xml":
+            visitors["whitespace"] = WhitespaceVisitor(self, xml_file)
+            visitors["deletions"] = DeletionVisitor(self, xml_file)
+            visitors["insertions"] = InsertionVisitor(self, xml_file)
+            visitors["paragraphs"] = ParagraphCountVisitor(self, xml_file)
+        return visitors
+
+    def validate_paragraph_counts(self):
+        """Report the change in paragraph count; informational, always passes."""
+        self.compare_paragraph_counts()
+        return True
+
     def compare_paragraph_counts(self):
         """Compare paragraph counts between original and new document."""
         original_count = self.count_paragraphs_in_original()
@@ -270,5 +164,108 @@ class DOCXSchemaValidator(BaseSchemaValidator):
         print(f"\nParagraphs: {original_count} → {new_count} ({diff_str})")
 
 
+def _text_preview(text):
+    """Return repr(text), shortened to 50 characters."""
+    return repr(text)[:50] + "..." if len(repr(text)) > 50 else repr(text)
+
+
+class WhitespaceVisitor(PartVisitor):
+    """Find w:t elements with leading or trailing whitespace but no xml:space='preserve'."""
+
+    tags = {f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}t"}
+
+    XML_SPACE = f"{{{DOCXSchemaValidator.XML_NAMESPACE}}}space"
+    LEADING_WHITESPACE = re.compile(r"^\s.*")
+    TRAILING_WHITESPACE = re.compile(r".*\s$")
+
+    def end(self, elem, name):
+        text = elem.text
+        if not text:
+            return
+        # Check if text starts or ends with whitespace
+        if self.LEADING_WHITESPACE.match(text) or self.TRAILING_WHITESPACE.match(text):
+            # Check if xml:space="preserve" attribute exists
+            if elem.get(self.XML_SPACE) != "preserve":
+                self.errors.append(
+                    Issue(
+                        str(self.relative_path),
+                        elem.sourceline,
+                        f"w:t element with whitespace missing xml:space='preserve': {_text_preview(text)}",
+                    )
+                )
+
+
+class DeletionVisitor(PartVisitor):
+    """Find w:t elements inside w:del, which XSD validation does not catch."""
+
+    DEL = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}del"
+    tags = {DEL, f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}t"}
+
+    def begin(self):
+        self.deleted = 0  # Number of open w:del ancestors
+
+    def start(self, elem, name):
+        if elem.tag == self.DEL:
+            self.deleted += 1
+
+    def end(self, elem, name):
+        if elem.tag == self.DEL:
+            self.deleted -= 1
+        elif self.deleted and elem.text:
+            self.errors.append(
+                Issue(
+                    str(self.relative_path),
+                    elem.sourceline,
+                    f"<w:t> found within <w:del>: {_text_preview(elem.text)}",
+                )
+            )
+
+
+class InsertionVisitor(PartVisitor):
+    """Find w:delText elements inside w:ins that are not within a w:del."""
+
+    INS = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}ins"
+    DEL = f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}del"
+    tags = {INS, DEL, f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}delText"}
+
+    def begin(self):
+        self.open = {self.INS: 0, self.DEL: 0}  # Open w:ins / w:del ancestors
+
+    def start(self, elem, name):
+        if elem.tag in self.open:
+            self.open[elem.tag] += 1
+
+    def end(self, elem, name):
+        if elem.tag in self.open:
+            self.open[elem.tag] -= 1
+        elif self.open[self.INS] and not self.open[self.DEL]:
+            self.errors.append(
+                Issue(
+                    str(self.relative_path),
+                    elem.sourceline,
+                    f"<w:delText> within <w:ins>: {_text_preview(elem.text or '')}",
+                )
+            )
+
+
+class ParagraphCountVisitor(PartVisitor):
+    """Count w:p elements; the result is the count, or the error that stopped it."""
+
+    tags = {f"{{{DOCXSchemaValidator.WORD_2006_NAMESPACE}}}p"}
+
+    def begin(self):
+        self.count = 0
+
+    def start(self, elem, name):
+        self.count += 1
+
+    def fail(self, error):
+        self.failed = True
+        self.error = str(error)
+
+    def result(self):
+        return self.error if self.failed else self.count
+
+
 if __name__ == "__main__":
     raise RuntimeError("This module should not be run directly.")
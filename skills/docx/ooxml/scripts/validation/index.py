@@ -0,0 +1,149 @@
+"""
+In-memory index of an OPC package: its parts, relationships and content types.
+"""
+
+import os
+from pathlib import Path, PurePosixPath
+
+
+class Relationship:
+    """One <Relationship> entry of a .rels part."""
+
+    __slots__ = ("id", "type", "target", "target_path", "sourceline")
+
+    def __init__(self, id, type, target, target_path, sourceline):
+        self.id = id
+        self.type = type
+        self.target = target
+        # Normalized path of the target inside the package (None if no target)
+        self.target_path = target_path
+        self.sourceline = sourceline
+
+
+class PackageIndex:
+    """Parts, relationships and content-type declarations of a package.
+
+    The list of parts is read once when the index is built; each .rels part
+    and [Content_Types].xml are parsed (through the shared PartStore) the
+    first time a check asks for them. Cross-part checks query this index
+    instead of globbing, resolving or stat-ing paths themselves.
+
+    Lookups for a part that failed to parse re-raise the parse error, so
+    every check reports it just as it would have when parsing the part.
+    """
+
+    RELATIONSHIPS_NAMESPACE = (
+        "http://schemas.openxmlformats.org/package/2006/relationships"
+    )
+    CONTENT_TYPES_NAMESPACE = (
+        "http://schemas.openxmlformats.org/package/2006/content-types"
+    )
+
+    def __init__(self, package, parts):
+        self.root = package.root
+        self.parts = parts
+        self.files = package.files()
+        self.paths = set(self.files)
+        self._names = {
+            f: PurePosixPath(f.relative_to(self.root).as_posix()) for f in self.files
+        }
+        self._relationships = {}
+        self._content_types = None
+
+    def is_part(self, path):
+        """Return True if path is a part (file) of the package."""
+        return Path(path) in self.paths
+
+    def glob(self, pattern):
+        """Return the parts matching a pattern relative to the package root."""
+        depth = len(PurePosixPath(pattern).parts)
+        return [
+            f
+            for f, name in self._names.items()
+            if len(name.parts) == depth and name.match(pattern)
+        ]
+
+    def with_suffix(self, suffix):
+        """Return the parts whose file name ends with suffix, in package order."""
+        return [f for f in self.files if f.name.endswith(suffix)]
+
+    def rels_file_for(self, part):
+        """Return the path of the .rels part that belongs to part."""
+        part = Path(part)
+        return part.parent / "_rels" / f"{part.name}.rels"
+
+    def relationships(self, rels_file):
+        """Return the Relationship entries of a .rels part, in document order."""
+        key = Path(rels_file)
+        if key not in self._relationships:
+            try:
+                self._relationships[key] = self._read_relationships(key)
+            except Exception as e:
+                self._relationships[key] = e
+
+        result = self._relationships[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def content_types(self):
+        """Return (declared part names, declared extensions) of [Content_Types].xml.
+
+        Part names are returned without their leading slash and extensions in
+        lower case.
+        """
+        if self._content_types is None:
+            try:
+                self._content_types = self._read_content_types()
+            except Exception as e:
+                self._content_types = e
+
+        if isinstance(self._content_types, Exception):
+            raise self._content_types
+        return self._content_types
+
+    def _read_relationships(self, rels_file):
+        # Targets are relative to the source part's folder; the package-level
+        # _rels/.rels has the package root as its source folder
+        if rels_file.name == ".rels":
+            base_dir = self.root
+        else:
+            base_dir = rels_file.parent.parent
+
+        relationships = []
+        for rel in self.parts.root(rels_file).findall(
+            f".//{{{self.RELATIONSHIPS_NAMESPACE}}}Relationship"
+        ):
+            target = rel.get("Target")
+            target_path = None
+            if target:
+                target_path = Path(os.path.normpath(base_dir / target))
+            relationships.append(
+                Relationship(
+                    rel.get("Id"),
+                    rel.get("Type", ""),
+                    target,
+                    target_path,
+                    rel.sourceline,
+                )
+            )
+        return relationships
+
+    def _read_content_types(self):
+        root = self.parts.root(self.root / "[Content_Types].xml")
+        declared_parts = set()
+        declared_extensions = set()
+
+        # Override declarations (specific files)
+        for override in root.findall(f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Override"):
+            part_name = override.get("PartName")
+            if part_name is not None:
+                declared_parts.add(part_name.lstrip("/"))
+
+        # Default declarations (by extension)
+        for default in root.findall(f".//{{{self.CONTENT_TYPES_NAMESPACE}}}Default"):
+            extension = default.get("Extension")
+            if extension is not None:
+                declared_extensions.add(extension.lower())
+
+        return declared_parts, declared_extensions
@@ -2,117 +2,108 @@
 Validator for tracked changes in Word documents.
 """
 
-import subprocess
-import tempfile
-import zipfile
 from pathlib import Path
 
+import lxml.etree
+
+from .baseline import load_baseline
+from .checks import EXPENSIVE
+from .diff import paragraph_diff
+from .package import open_package
+from .parts import PartStore
+from .results import Issue
+
 
 class RedliningValidator:
     """Validator for tracked changes in Word documents."""
 
+    # The comparison with the original runs as a single check
+    CHECKS = [("redlining", EXPENSIVE)]
+
     def __init__(self, unpacked_dir, original_docx, verbose=False):
-        self.unpacked_dir = Path(unpacked_dir)
+        self.package = open_package(unpacked_dir)
+        self.unpacked_dir = self.package.root
         self.original_docx = Path(original_docx)
         self.verbose = verbose
+        self.parts = PartStore(self.package)
+        self.baseline_bytes_parsed = 0
+        # Issues found by the last validate(), from which its report is printed
+        self.issues = []
         self.namespaces = {
             "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
         }
 
     def validate(self):
         """Main validation method that returns True if valid, False otherwise."""
+        self.issues = []
+
         # Verify unpacked directory exists and has correct structure
         modified_file = self.unpacked_dir / "word" / "document.xml"
-        if not modified_file.exists():
-            print(f"FAILED - Modified document.xml not found at {modified_file}")
-            return False
+        if not self.package.is_file(modified_file):
+            return self._fail(
+                Issue("word/document.xml", None, "Modified document.xml not found"),
+                f"FAILED - Modified document.xml not found at {modified_file}",
+            )
 
         # First, check if there are any tracked changes by Claude to validate
         try:
-            import xml.etree.ElementTree as ET
-
-            tree = ET.parse(modified_file)
-            root = tree.getroot()
-
-            # Check for w:del or w:ins tags authored by Claude
-            del_elements = root.findall(".//w:del", self.namespaces)
-            ins_elements = root.findall(".//w:ins", self.namespaces)
-
-            # Filter to only include changes by Claude
-            claude_del_elements = [
-                elem
-                for elem in del_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-            claude_ins_elements = [
-                elem
-                for elem in ins_elements
-                if elem.get(f"{{{self.namespaces['w']}}}author") == "Claude"
-            ]
-
-            # Redlining validation is only needed if tracked changes by Claude have been used.
-            if not claude_del_elements and not claude_ins_elements:
-                if self.verbose:
-                    print("PASSED - No tracked changes by Claude found.")
-                return True
-
+            root = self.parts.root(modified_file)
         except Exception:
             # If we can't parse the XML, continue with full validation
-            pass
-
-        # Create temporary directory for unpacking original docx
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-
-            # Unpack original docx
-            try:
-                with zipfile.ZipFile(self.original_docx, "r") as zip_ref:
-                    zip_ref.extractall(temp_path)
-            except Exception as e:
-                print(f"FAILED - Error unpacking original docx: {e}")
-                return False
-
-            original_file = temp_path / "word" / "document.xml"
-            if not original_file.exists():
-                print(
-                    f"FAILED - Original document.xml not found in {self.original_docx}"
-                )
-                return False
-
-            # Parse both XML files using xml.etree.ElementTree for redlining validation
-            try:
-                import xml.etree.ElementTree as ET
+            root = None
+        if root is not None and not self._has_claude_changes(root):
+            # Redlining validation is only needed if tracked changes by Claude have been used.
+            if self.verbose:
+                print("PASSED - No tracked changes by Claude found.")
+            return True
 
-                modified_tree = ET.parse(modified_file)
-                modified_root = modified_tree.getroot()
-                original_tree = ET.parse(original_file)
-                original_root = original_tree.getroot()
-            except ET.ParseError as e:
-                print(f"FAILED - Error parsing XML files: {e}")
-                return False
+        # Read the original document.xml straight from the original package
+        try:
+            baseline = load_baseline(self.original_docx)
+        except Exception as e:
+            message = f"Error unpacking original docx: {e}"
+            return self._fail(Issue(None, None, message), f"FAILED - {message}")
 
-            # Remove Claude's tracked changes from both documents
-            self._remove_claude_tracked_changes(original_root)
-            self._remove_claude_tracked_changes(modified_root)
+        if not baseline.has_part("word/document.xml"):
+            message = f"Original document.xml not found in {self.original_docx}"
+            return self._fail(Issue(None, None, message), f"FAILED - {message}")
 
-            # Extract and compare text content
-            modified_text = self._extract_text_content(modified_root)
-            original_text = self._extract_text_content(original_root)
+        # Both trees are shared with other checks and are only read
+        try:
+            modified_root = self.parts.root(modified_file)
+            bytes_before = baseline.bytes_parsed
+            original_root = baseline.root("word/document.xml")
+            self.baseline_bytes_parsed += baseline.bytes_parsed - bytes_before
+        except lxml.etree.XMLSyntaxError as e:
+            message = f"Error parsing XML files: {e}"
+            return self._fail(Issue(None, None, message), f"FAILED - {message}")
+
+        # Extract and compare the paragraphs, without Claude's tracked changes
+        modified_paragraphs = self._extract_paragraphs(modified_root)
+        original_paragraphs = self._extract_paragraphs(original_root)
+
+        if modified_paragraphs != original_paragraphs:
+            # Every changed paragraph is an issue, shown with its
+            # character-level differences
+            diff = paragraph_diff(original_paragraphs, modified_paragraphs)
+            self.issues = [
+                Issue("word/document.xml", None, line) for line in diff.split("\n")
+            ]
+            print(self._generate_detailed_diff(self.issues))
+            return False
 
-            if modified_text != original_text:
-                # Show detailed character-level differences for each paragraph
-                error_message = self._generate_detailed_diff(
-                    original_text, modified_text
-                )
-                print(error_message)
-                return False
+        if self.verbose:
+            print("PASSED - All changes by Claude are properly tracked")
+        return True
 
-            if self.verbose:
-                print("PASSED - All changes by Claude are properly tracked")
-            return True
+    def _fail(self, issue, report):
+        """Record the issue that failed validation and print report; return False."""
+        self.issues.append(issue)
+        print(report)
+        return False
 
-    def _generate_detailed_diff(self, original_text, modified_text):
-        """Generate detailed word-level differences using git word diff."""
+    def _generate_detailed_diff(self, issues):
+        """Generate the report for the paragraphs that differ (see diff.paragraph_diff())."""
         error_parts = [
             "FAILED - Document text doesn't match after removing Claude's tracked changes",
             "",
@@ -127,152 +118,79 @@ class RedliningValidator:
             "",
         ]
 
-        # Show git word diff
-        git_diff = self._get_git_word_diff(original_text, modified_text)
-        if git_diff:
-            error_parts.extend(["Differences:", "============", git_diff])
-        else:
-            error_parts.append("Unable to generate word diff (git not available)")
-
+        error_parts.extend(
+            [
+                "Differences:",
+                "============",
+                *(issue.message for issue in issues),
+            ]
+        )
         return "\n".join(error_parts)
 
-    def _get_git_word_diff(self, original_text, modified_text):
-        """Generate word diff using git with character-level precision."""
-        try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-
-                # Create two files
-                original_file = temp_path / "original.txt"
-                modified_file = temp_path / "modified.txt"
-
-                original_file.write_text(original_text, encoding="utf-8")
-                modified_file.write_text(modified_text, encoding="utf-8")
-
-                # Try character-level diff first for precise differences
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "--word-diff-regex=.",  # Character-by-character diff
-                        "-U0",  # Zero lines of context - show only changed lines
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    # Clean up the output - remove git diff header lines
-                    lines = result.stdout.split("\n")
-                    # Skip the header lines (diff --git, index, +++, ---, @@)
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-
-                    if content_lines:
-                        return "\n".join(content_lines)
+    @property
+    def bytes_parsed(self):
+        """Bytes of XML parsed by this validator, including the original's."""
+        return self.parts.bytes_parsed + self.baseline_bytes_parsed
 
-                # Fallback to word-level diff if character-level is too verbose
-                result = subprocess.run(
-                    [
-                        "git",
-                        "diff",
-                        "--word-diff=plain",
-                        "-U0",  # Zero lines of context
-                        "--no-index",
-                        str(original_file),
-                        str(modified_file),
-                    ],
-                    capture_output=True,
-                    text=True,
-                )
-
-                if result.stdout.strip():
-                    lines = result.stdout.split("\n")
-                    content_lines = []
-                    in_content = False
-                    for line in lines:
-                        if line.startswith("@@"):
-                            in_content = True
-                            continue
-                        if in_content and line.strip():
-                            content_lines.append(line)
-                    return "\n".join(content_lines)
-
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
-            # Git not available or other error, return None to use fallback
-            pass
-
-        return None
-
-    def _remove_claude_tracked_changes(self, root):
-        """Remove tracked changes authored by Claude from the XML root."""
-        ins_tag = f"{{{self.namespaces['w']}}}ins"
-        del_tag = f"{{{self.namespaces['w']}}}del"
+    def _has_claude_changes(self, root):
+        """Return True if root contains w:ins or w:del elements authored by Claude."""
         author_attr = f"{{{self.namespaces['w']}}}author"
+        for elem in root.iter(
+            f"{{{self.namespaces['w']}}}ins", f"{{{self.namespaces['w']}}}del"
+        ):
+            if elem.get(author_attr) == "Claude":
+                return True
+        return False
 
-        # Remove w:ins elements
-        for parent in root.iter():
-            to_remove = []
-            for child in parent:
-                if child.tag == ins_tag and child.get(author_attr) == "Claude":
-                    to_remove.append(child)
-            for elem in to_remove:
-                parent.remove(elem)
-
-        # Unwrap content in w:del elements where author is "Claude"
-        deltext_tag = f"{{{self.namespaces['w']}}}delText"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
-        for parent in root.iter():
-            to_process = []
-            for child in parent:
-                if child.tag == del_tag and child.get(author_attr) == "Claude":
-                    to_process.append((child, list(parent).index(child)))
-
-            # Process in reverse order to maintain indices
-            for del_elem, del_index in reversed(to_process):
-                # Convert w:delText to w:t before moving
-                for elem in del_elem.iter():
-                    if elem.tag == deltext_tag:
-                        elem.tag = t_tag
-
-                # Move all children of w:del to its parent before removing w:del
-                for child in reversed(list(del_elem)):
-                    parent.insert(del_index, child)
-                parent.remove(del_elem)
+    def _extract_paragraphs(self, root):
+        """Return the text of each non-empty paragraph of Word XML.
 
-    def _extract_text_content(self, root):
-        """Extract text content from Word XML, preserving paragraph structure.
+        Claude's tracked changes are rejected on the fly: Claude's w:ins
+        elements are skipped and the w:delText inside Claude's w:del elements
+        is read as text. This is a single pass over the tree, which is left
+        unmodified.
 
         Empty paragraphs are skipped to avoid false positives when tracked
         insertions add only structural elements without text content.
         """
-        p_tag = f"{{{self.namespaces['w']}}}p"
-        t_tag = f"{{{self.namespaces['w']}}}t"
-
+        w = self.namespaces["w"]
+        p_tag = f"{{{w}}}p"
+        t_tag = f"{{{w}}}t"
+        ins_tag = f"{{{w}}}ins"
+        del_tag = f"{{{w}}}del"
+        deltext_tag = f"{{{w}}}delText"
+        author_attr = f"{{{w}}}author"
+
+        # Text parts of every paragraph, in document order of the paragraphs;
+        # text inside nested paragraphs also belongs to the enclosing ones
         paragraphs = []
-        for p_elem in root.findall(f".//{p_tag}"):
-            # Get all text elements within this paragraph
-            text_parts = []
-            for t_elem in p_elem.findall(f".//{t_tag}"):
-                if t_elem.text:
-                    text_parts.append(t_elem.text)
-            paragraph_text = "".join(text_parts)
-            # Skip empty paragraphs - they don't affect content validation
-            if paragraph_text:
-                paragraphs.append(paragraph_text)
-
-        return "\n".join(paragraphs)
+        open_paragraphs = []
+        claude_deletions = 0
+
+        walker = lxml.etree.iterwalk(root, events=("start", "end"))
+        for event, elem in walker:
+            tag = elem.tag
+            if event == "end":
+                if tag == p_tag:
+                    open_paragraphs.pop()
+                elif tag == del_tag and elem.get(author_attr) == "Claude":
+                    claude_deletions -= 1
+                continue
+
+            if tag == t_tag or (tag == deltext_tag and claude_deletions):
+                if elem.text:
+                    for text_parts in open_paragraphs:
+                        text_parts.append(elem.text)
+            elif tag == p_tag:
+                paragraphs.append([])
+                open_paragraphs.append(paragraphs[-1])
+            elif tag == ins_tag and elem.get(author_attr) == "Claude":
+                walker.skip_subtree()
+            elif tag == del_tag and elem.get(author_attr) == "Claude":
+                claude_deletions += 1
+
+        # Skip empty paragraphs - they don't affect content validation
+        return [text for text in ("".join(parts) for parts in paragraphs) if text]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+"""
+Structured results of validation checks, with timing and parse statistics.
+"""
+
+import contextlib
+import io
+import sys
+import time
+
+
+class Issue:
+    """One problem reported by a check.
+
+    str(issue) is the issue as it appears in the text report: text if given,
+    otherwise "part: Line n: message" without the parts that are None.
+    """
+
+    __slots__ = ("part", "line", "message", "text")
+
+    def __init__(self, part, line, message, text=None):
+        self.part = part  # Package part name, or None for package-level issues
+        self.line = line  # Line number in the part, or None
+        self.message = message
+        self.text = text  # Report wording, when it does not follow the pattern
+
+    def __str__(self):
+        if self.text is not None:
+            return self.text
+        location = [self.part] if self.part is not None else []
+        if self.line is not None:
+            location.append(f"Line {self.line}")
+        return ": ".join([*location, self.message])
+
+    def to_dict(self):
+        return {"part": self.part, "line": self.line, "message": self.message}
+
+    def to_json(self):
+        """Return the issue as a JSON-serializable list (see from_json())."""
+        return [self.part, self.line, self.message, self.text]
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(*data)
+
+
+class CheckResult:
+    """Outcome of one check of one validator run."""
+
+    def __init__(self, validator, check, passed, elapsed, bytes_parsed, output):
+        self.validator = validator
+        self.check = check
+        self.passed = passed
+        self.elapsed = elapsed
+        self.bytes_parsed = bytes_parsed
+        # Report exactly as printed by the check
+        self.output = output
+        # Issues found by the check, from which its report was printed
+        self.issues = []
+
+    def to_dict(self):
+        return {
+            "validator": self.validator,
+            "check": self.check,
+            "passed": self.passed,
+            "elapsed": round(self.elapsed, 6),
+            "bytes_parsed": self.bytes_parsed,
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+
+
+def run_check(validator, check, method, bytes_parsed):
+    """Run method() as the named check and return its CheckResult.
+
+    The check's report is captured while it runs and then printed, so the
+    text output is unchanged. bytes_parsed() must return a running count of
+    bytes parsed; the difference over the check is recorded.
+    """
+    output = io.StringIO()
+    bytes_before = bytes_parsed()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(output):
+            passed = method()
+    finally:
+        sys.stdout.write(output.getvalue())
+    elapsed = time.perf_counter() - start
+
+    return CheckResult(
+        validator,
+        check,
+        passed,
+        elapsed,
+        bytes_parsed() - bytes_before,
+        output.getvalue(),
+    )
+
+
+def format_profile(results):
+    """Return a table of per-check time and bytes parsed, slowest check first."""
+    lines = [
+        f"{'Check':<32} {'Result':<7} {'Time (s)':>9} {'Parsed (KB)':>12}",
+        "-" * 63,
+    ]
+    for result in sorted(results, key=lambda r: r.elapsed, reverse=True):
+        lines.append(
+            f"{result.check:<32} {'passed' if result.passed else 'FAILED':<7} "
+            f"{result.elapsed:>9.3f} {result.bytes_parsed / 1024:>12.1f}"
+        )
+    lines.append("-" * 63)
+    lines.append(
+        f"{'Total':<32} {'':<7} {sum(r.elapsed for r in results):>9.3f} "
+        f"{sum(r.bytes_parsed for r in results) / 1024:>12.1f}"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,230 @@
+"""
+Process-wide cache of compiled XSD schemas, loaded from pre-resolved bundles.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import lxml.etree
+
+from .cache import CACHE_VERSION, cache_dir, file_sha256, write_json_atomic
+
+XSD_NAMESPACE = "http://www.w3.org/2001/XMLSchema"
+
+# Schemas shipped with the validator
+SCHEMAS_DIR = Path(__file__).parent.parent.parent / "schemas"
+
+
+class SchemaBundleStore:
+    """One file per root schema holding every document of its import graph.
+
+    A root schema such as wml.xsd pulls in a chain of xsd:import, include
+    and redefine references across several schema folders. The first time a
+    root is needed its graph is resolved and written to a bundle in the
+    cache directory; later processes read that one file and serve every
+    import from memory instead of opening each schema file.
+
+    A bundle records the size, modification time and SHA-256 of each source
+    file. Files whose size and time are unchanged are trusted; any other
+    file is rehashed, and the bundle is rebuilt if its contents changed.
+    Remote schema locations are left to lxml, as before.
+    """
+
+    def __init__(self, directory=None):
+        self._directory = Path(directory) if directory else None
+        self.enabled = os.environ.get("OOXML_VALIDATION_CACHE", "1") != "0"
+        self.loaded = 0
+        self.built = 0
+        self._digests = {}
+
+    @property
+    def directory(self):
+        return self._directory or cache_dir() / "schemas"
+
+    def documents(self, schema_path):
+        """Return {normalized path: schema text} for the import graph of schema_path."""
+        schema_path = os.path.normpath(schema_path)
+        if self.enabled:
+            bundle = self._load(schema_path)
+            if bundle is not None:
+                self.loaded += 1
+                return bundle["documents"]
+        return self.build(schema_path)["documents"]
+
+    def digest(self, schema_path):
+        """Return a SHA-256 of every source file in the import graph of schema_path.
+
+        Results derived from validating against the schema can be keyed on
+        it, so that a change to any imported or included schema invalidates
+        them. Computed once per process.
+        """
+        schema_path = str(Path(schema_path).resolve())
+        if schema_path not in self._digests:
+            bundle = self._load(schema_path) if self.enabled else None
+            if bundle is None:
+                bundle = self.build(schema_path)
+            hashes = sorted(sha256 for _, _, sha256 in bundle["sources"].values())
+            self._digests[schema_path] = hashlib.sha256(
+                "|".join(hashes).encode("utf-8")
+            ).hexdigest()
+        return self._digests[schema_path]
+
+    def build(self, schema_path):
+        """Resolve the import graph of schema_path and (re)write its bundle."""
+        schema_path = os.path.normpath(schema_path)
+        documents = {}
+        sources = {}
+        pending = [schema_path]
+        while pending:
+            path = pending.pop()
+            if path in documents:
+                continue
+            data = Path(path).read_bytes()
+            stat = os.stat(path)
+            documents[path] = data.decode("utf-8")
+            sources[path] = [
+                stat.st_size,
+                stat.st_mtime_ns,
+                hashlib.sha256(data).hexdigest(),
+            ]
+            for location in _schema_locations(data):
+                if "://" in location:
+                    continue
+                location = os.path.normpath(
+                    os.path.join(os.path.dirname(path), location)
+                )
+                if location not in documents and os.path.isfile(location):
+                    pending.append(location)
+
+        bundle = {"root": schema_path, "sources": sources, "documents": documents}
+        if self.enabled:
+            try:
+                write_json_atomic(self._path(schema_path), bundle)
+            except OSError:
+                pass  # A read-only or full cache directory only costs speed
+        self.built += 1
+        return bundle
+
+    def _path(self, schema_path):
+        digest = hashlib.sha256(schema_path.encode("utf-8")).hexdigest()[:16]
+        name = Path(schema_path).stem
+        return self.directory / f"v{CACHE_VERSION}-{name}-{digest}.json"
+
+    def _load(self, schema_path):
+        try:
+            with open(self._path(schema_path), encoding="utf-8") as f:
+                bundle = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        touched = False
+        for path, (size, mtime_ns, sha256) in bundle["sources"].items():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if (stat.st_size, stat.st_mtime_ns) == (size, mtime_ns):
+                continue
+            if stat.st_size != size or file_sha256(path) != sha256:
+                return None
+            # Same contents under a new modification time
+            bundle["sources"][path] = [size, stat.st_mtime_ns, sha256]
+            touched = True
+
+        if touched:
+            try:
+                write_json_atomic(self._path(schema_path), bundle)
+            except OSError:
+                pass
+        return bundle
+
+
+def _schema_locations(data):
+    """Return the schemaLocation of every import, include and redefine in a schema."""
+    root = lxml.etree.fromstring(data)
+    return [
+        elem.get("schemaLocation")
+        for elem in root.iterchildren(
+            f"{{{XSD_NAMESPACE}}}import",
+            f"{{{XSD_NAMESPACE}}}include",
+            f"{{{XSD_NAMESPACE}}}redefine",
+        )
+        if elem.get("schemaLocation")
+    ]
+
+
+class _BundleResolver(lxml.etree.Resolver):
+    """Serve the documents of a schema bundle to lxml from memory."""
+
+    def __init__(self, documents):
+        super().__init__()
+        self.documents = documents
+
+    def resolve(self, url, pubid, context):
+        text = self.documents.get(os.path.normpath(url)) if url else None
+        if text is None:
+            return None  # Not in the bundle: let lxml load it as usual
+        return self.resolve_string(text.encode("utf-8"), context, base_url=url)
+
+
+class SchemaCache:
+    """Compile each XSD schema (and its import chain) once per process.
+
+    Compiled schemas are keyed by resolved schema path and shared by every
+    validator instance, so a package with hundreds of parts compiles each
+    root schema a single time.
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.compile_time = 0.0
+
+    def get(self, schema_path):
+        """Return the compiled lxml XMLSchema for schema_path."""
+        key = str(Path(schema_path).resolve())
+
+        with self._lock:
+            schema = self._schemas.get(key)
+            if schema is not None:
+                self.hits += 1
+                return schema
+
+            self.misses += 1
+            start = time.perf_counter()
+            try:
+                documents = SCHEMA_BUNDLES.documents(key)
+                parser = lxml.etree.XMLParser()
+                parser.resolvers.add(_BundleResolver(documents))
+                xsd_doc = lxml.etree.ElementTree(
+                    lxml.etree.fromstring(
+                        documents[os.path.normpath(key)].encode("utf-8"),
+                        parser=parser,
+                        base_url=key,
+                    )
+                )
+                schema = lxml.etree.XMLSchema(xsd_doc)
+            finally:
+                self.compile_time += time.perf_counter() - start
+
+            self._schemas[key] = schema
+            return schema
+
+    def clear(self):
+        """Forget all compiled schemas and reset the counters."""
+        with self._lock:
+            self._schemas.clear()
+            self.hits = 0
+            self.misses = 0
+            self.compile_time = 0.0
+
+
+# Shared by every validator in this process
+SCHEMA_BUNDLES = SchemaBundleStore()
+SCHEMA_CACHE = SchemaCache()
@@ -0,0 +1,63 @@
+"""
+Long-running validation server that keeps schemas and baselines warm between runs.
+"""
+
+import contextlib
+import json
+import os
+import signal
+import socketserver
+import sys
+
+from .runner import run_request
+
+
+class ValidationRequestHandler(socketserver.StreamRequestHandler):
+    """Read one JSON request line and answer with one JSON response line."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = run_request(json.loads(line))
+        except ValueError as e:
+            response = {
+                "stdout": "",
+                "stderr": f"Error: Invalid request: {e}\n",
+                "exit_code": 2,
+            }
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class ValidationServer(socketserver.UnixStreamServer):
+    """Serve validate requests on a Unix socket, one request at a time.
+
+    Requests are handled sequentially in this process, so compiled schemas,
+    opened originals and baseline error sets stay in memory for the next
+    request, and the captured stdout/stderr of concurrent runs cannot mix.
+    """
+
+    def __init__(self, socket_path):
+        self.socket_path = str(socket_path)
+        # A socket file left behind by a previous server would block bind()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        super().__init__(self.socket_path, ValidationRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path):
+    """Serve validate requests on socket_path until interrupted or terminated."""
+    # Leave through the normal exit path on SIGTERM so the socket is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with ValidationServer(socket_path) as server:
+        print(f"Validation server listening on {socket_path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
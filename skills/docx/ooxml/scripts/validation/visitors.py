@@ -0,0 +1,121 @@
+"""
+Single-pass visitor engine for checks that walk the elements of a part.
+"""
+
+from functools import lru_cache
+
+from .results import Issue
+
+
+@lru_cache(maxsize=None)
+def local_name(qname):
+    """Return the local part of a Clark-notation name ("{ns}tag" -> "tag")."""
+    return qname.rpartition("}")[2]
+
+
+class PartVisitor:
+    """A check that runs as part of the shared walk over one part.
+
+    Subclasses register interest by setting tags to the Clark-notation tags
+    they want to see (None means every element) or by overriding wants().
+    skip lists tags whose whole subtree, including the element itself, the
+    visitor should not see. start() is called with the element and its local
+    name when the element opens and end() when it closes. Text is only
+    guaranteed to be available in end().
+
+    An exception raised by a visitor stops that visitor for the rest of the
+    part and is reported through fail(); other visitors are unaffected.
+    """
+
+    tags = None
+    skip = ()
+
+    def __init__(self, validator, xml_file):
+        self.validator = validator
+        self.xml_file = xml_file
+        self.relative_path = xml_file.relative_to(validator.unpacked_dir)
+        self.errors = []
+        self.failed = False
+        self.hidden = 0  # Depth inside skipped subtrees
+
+    def wants(self, tag):
+        """Return True if start() and end() should be called for elements with tag."""
+        return self.tags is None or tag in self.tags
+
+    def begin(self):
+        """Prepare for the walk (for example by reading a related part)."""
+
+    def start(self, elem, name):
+        """Called when an element this visitor is interested in opens."""
+
+    def end(self, elem, name):
+        """Called when an element this visitor is interested in closes."""
+
+    def fail(self, error):
+        """Record an exception that stopped this visitor."""
+        self.failed = True
+        self.errors.append(Issue(str(self.relative_path), None, f"Error: {error}"))
+
+    def result(self):
+        """Return the result of the check for this part (JSON-serializable or Issues)."""
+        return self.errors
+
+
+def walk(events, visitors):
+    """Dispatch (event, element) pairs to every interested visitor.
+
+    events is an iterable of ("start" | "end", element) pairs in document
+    order, such as PartStore.events() produces.
+    Which visitors handle a tag is worked out once per tag, so each element
+    costs one dictionary lookup plus the calls to interested visitors.
+    """
+    visitors = list(visitors)
+    for visitor in visitors:
+        try:
+            visitor.begin()
+        except Exception as e:
+            visitor.fail(e)
+
+    def handlers(event, tag):
+        active = [v for v in visitors if not (v.hidden or v.failed) and v.wants(tag)]
+        if event == "start":
+            return [v.start for v in active]
+        return [v.end for v in active if type(v).end is not PartVisitor.end]
+
+    skip_tags = {tag for v in visitors for tag in v.skip}
+
+    # Per event: tag -> (local name, bound handlers of interested visitors).
+    # Tags that start a skipped subtree are never cached, since entering and
+    # leaving them changes which visitors are active.
+    tables = {"start": {}, "end": {}}
+
+    for event, elem in events:
+        try:
+            name, methods = tables[event][elem.tag]
+        except KeyError:
+            tag = elem.tag
+            if not isinstance(tag, str):
+                continue  # Comments and processing instructions
+            name = local_name(tag)
+            if tag in skip_tags:
+                skippers = [v for v in visitors if tag in v.skip]
+                if event == "start":
+                    for v in skippers:
+                        v.hidden += 1
+                    methods = handlers(event, tag)
+                else:
+                    methods = handlers(event, tag)
+                    for v in skippers:
+                        v.hidden -= 1
+                # Handlers for every other tag depend on the visitors now active
+                tables = {"start": {}, "end": {}}
+            else:
+                methods = handlers(event, tag)
+                tables[event][tag] = (name, methods)
+
+        for method in methods:
+            try:
+                method(elem, name)
+            except Exception as e:
+                method.__self__.fail(e)
+                tables = {"start": {}, "end": {}}
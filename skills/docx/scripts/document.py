@@ -852,7 +852,8 @@ class Document:
 
         # Run validations
         if not schema_validator.validate():
-            raise ValueError("Schema validation failed")
+            failed = [r.check for r in schema_validator.results if not r.passed]
+            raise ValueError(f"Schema validation failed: {', '.join(failed)}")
         if not redlining_validator.validate():
             raise ValueError("Redlining validation failed")
 
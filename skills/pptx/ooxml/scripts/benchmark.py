@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Benchmark the validators on synthetic Word and PowerPoint packages of several sizes.
+
+Usage:
+    python benchmark.py [--formats docx pptx revisions] [--docx-sizes 100 1000 10000]
+                        [--pptx-sizes 10 50 200] [--revision-counts 1000 10000]
+                        [--output results.json]
+
+Each generated .docx has N paragraphs, with tracked changes and comments; it
+is validated against an original without the tracked changes, so the
+redlining comparison does its full work. The revisions cases put N of
+Claude's revisions in a single paragraph. Each generated .pptx has N slides
+with layouts, notes and images. Every (format, size) case runs in a fresh
+process, which reports the time and bytes parsed of each check, the total
+time and its peak resident memory. Results are printed (or written) as JSON
+so runs can be compared across commits.
+
+Persistent caches (baseline errors, schema bundles) are disabled in the
+measured processes unless --warm-caches is given.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+W_NAMESPACES = (
+    'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+P_NAMESPACES = (
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"'
+)
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+DATE = "2024-01-01T00:00:00Z"
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod".split()
+
+# A 1x1 transparent PNG
+PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+def relationships(entries):
+    """Return a .rels part for (id, type, target) entries."""
+    rels = "".join(
+        f'<Relationship Id="{rid}" Type="{REL_TYPE}/{rel_type}" Target="{target}"/>'
+        for rid, rel_type, target in entries
+    )
+    return (
+        f"{XML_DECLARATION}<Relationships "
+        f'xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f"{rels}</Relationships>"
+    )
+
+
+def content_types(defaults, overrides):
+    """Return [Content_Types].xml for {extension: type} and {part: type}."""
+    entries = "".join(
+        f'<Default Extension="{ext}" ContentType="{ctype}"/>'
+        for ext, ctype in defaults.items()
+    ) + "".join(
+        f'<Override PartName="/{part}" ContentType="{ctype}"/>'
+        for part, ctype in overrides.items()
+    )
+    return (
+        f"{XML_DECLARATION}<Types "
+        f'xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        f"{entries}</Types>"
+    )
+
+
+def write_package(path, parts):
+    """Write {part name: str or bytes} as a zip package."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def sentence(i, words=8):
+    return " ".join(WORDS[(i + k) % len(WORDS)] for k in range(words))
+
+
+def docx_parts(paragraphs, tracked, revisions=1):
+    """Return the parts of a .docx with the given number of paragraphs.
+
+    Every 10th paragraph has revisions words replaced by Claude; with
+    tracked=False it holds the original text instead. Every 15th paragraph carries a tracked
+    insertion by another author and every 20th a comment, in both variants.
+    """
+    body = []
+    comments = []
+    change_id = 1
+    for i in range(paragraphs):
+        runs = [
+            f'<w:r><w:t xml:space="preserve">Paragraph {i} {sentence(i)} </w:t></w:r>'
+        ]
+
+        for _ in range(revisions if i % 10 == 0 else 0):
+            if tracked:
+                runs.append(
+                    f'<w:del w:id="{change_id}" w:author="Claude" w:date="{DATE}">'
+                    f"<w:r><w:delText>old</w:delText></w:r></w:del>"
+                    f'<w:ins w:id="{change_id + 1}" w:author="Claude" w:date="{DATE}">'
+                    f"<w:r><w:t>new</w:t></w:r></w:ins>"
+                )
+            else:
+                runs.append("<w:r><w:t>old</w:t></w:r>")
+            change_id += 2
+
+        if i % 15 == 0:
+            runs.append(
+                f'<w:ins w:id="{change_id}" w:author="Reviewer" w:date="{DATE}">'
+                f"<w:r><w:t>added</w:t></w:r></w:ins>"
+            )
+        change_id += 1
+
+        if i % 20 == 0:
+            comment_id = len(comments)
+            runs.insert(0, f'<w:commentRangeStart w:id="{comment_id}"/>')
+            runs.append(
+                f'<w:commentRangeEnd w:id="{comment_id}"/>'
+                f'<w:r><w:commentReference w:id="{comment_id}"/></w:r>'
+            )
+            comments.append(
+                f'<w:comment w:id="{comment_id}" w:author="Reviewer" '
+                f'w:date="{DATE}" w:initials="R"><w:p><w:r>'
+                f"<w:t>Comment on paragraph {i}</w:t></w:r></w:p></w:comment>"
+            )
+
+        body.append(f"<w:p>{''.join(runs)}</w:p>")
+
+    document = (
+        f"{XML_DECLARATION}<w:document {W_NAMESPACES}><w:body>{''.join(body)}"
+        f'<w:sectPr><w:pgSz w:w="12240" w:h="15840"/></w:sectPr></w:body></w:document>'
+    )
+    main = "application/vnd.openxmlformats-officedocument.wordprocessingml"
+    return {
+        "[Content_Types].xml": content_types(
+            {
+                "rels": "application/vnd.openxmlformats-package.relationships+xml",
+                "xml": "application/xml",
+            },
+            {
+                "word/document.xml": f"{main}.document.main+xml",
+                "word/comments.xml": f"{main}.comments+xml",
+            },
+        ),
+        "_rels/.rels": relationships([("rId1", "officeDocument", "word/document.xml")]),
+        "word/document.xml": document,
+        "word/_rels/document.xml.rels": relationships(
+            [("rId1", "comments", "comments.xml")]
+        ),
+        "word/comments.xml": (
+            f"{XML_DECLARATION}<w:comments {W_NAMESPACES}>{''.join(comments)}"
+            f"</w:comments>"
+        ),
+    }
+
+
+def shape_tree(shapes=""):
+    return (
+        "<p:cSld><p:spTree><p:nvGrpSpPr>"
+        '<p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+        f"<p:grpSpPr/>{shapes}</p:spTree></p:cSld>"
+    )
+
+
+def text_shape(shape_id, text):
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="{shape_id}" name="Text {shape_id}"/>'
+        f"<p:cNvSpPr/><p:nvPr/></p:nvSpPr><p:spPr/>"
+        f"<p:txBody><a:bodyPr/><a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:txBody></p:sp>"
+    )
+
+
+def picture(shape_id, rid):
+    return (
+        f'<p:pic><p:nvPicPr><p:cNvPr id="{shape_id}" name="Picture {shape_id}"/>'
+        f"<p:cNvPicPr/><p:nvPr/></p:nvPicPr>"
+        f'<p:blipFill><a:blip r:embed="{rid}"/><a:stretch><a:fillRect/></a:stretch>'
+        f'</p:blipFill><p:spPr><a:prstGeom prst="rect"><a:avLst/></a:prstGeom>'
+        f"</p:spPr></p:pic>"
+    )
+
+
+COLOR_MAP = (
+    '<p:clrMap bg1="lt1" tx1="dk1" bg2="lt2" tx2="dk2" accent1="accent1" '
+    'accent2="accent2" accent3="accent3" accent4="accent4" accent5="accent5" '
+    'accent6="accent6" hlink="hlink" folHlink="folHlink"/>'
+)
+
+
+def pptx_parts(slides, layouts=3):
+    """Return the parts of a .pptx with slides slides, each with notes and an image."""
+    main = "application/vnd.openxmlformats-officedocument.presentationml"
+    overrides = {
+        "ppt/presentation.xml": f"{main}.presentation.main+xml",
+        "ppt/slideMasters/slideMaster1.xml": f"{main}.slideMaster+xml",
+        "ppt/notesMasters/notesMaster1.xml": f"{main}.notesMaster+xml",
+        "ppt/theme/theme1.xml": "application/vnd.openxmlformats-officedocument.theme+xml",
+    }
+    parts = {}
+
+    presentation_rels = [
+        ("rId1", "slideMaster", "slideMasters/slideMaster1.xml"),
+        ("rId2", "notesMaster", "notesMasters/notesMaster1.xml"),
+        ("rId3", "theme", "theme/theme1.xml"),
+    ]
+    slide_ids = []
+    for n in range(1, slides + 1):
+        presentation_rels.append((f"rId{n + 10}", "slide", f"slides/slide{n}.xml"))
+        slide_ids.append(f'<p:sldId id="{255 + n}" r:id="rId{n + 10}"/>')
+    parts["ppt/presentation.xml"] = (
+        f"{XML_DECLARATION}<p:presentation {P_NAMESPACES}>"
+        '<p:sldMasterIdLst><p:sldMasterId id="2147483648" r:id="rId1"/></p:sldMasterIdLst>'
+        '<p:notesMasterIdLst><p:notesMasterId r:id="rId2"/></p:notesMasterIdLst>'
+        f"<p:sldIdLst>{''.join(slide_ids)}</p:sldIdLst>"
+        '<p:sldSz cx="12192000" cy="6858000"/><p:notesSz cx="6858000" cy="9144000"/>'
+        "</p:presentation>"
+    )
+    parts["ppt/_rels/presentation.xml.rels"] = relationships(presentation_rels)
+
+    layout_ids = "".join(
+        f'<p:sldLayoutId id="{2147483649 + j}" r:id="rId{j + 1}"/>'
+        for j in range(layouts)
+    )
+    parts["ppt/slideMasters/slideMaster1.xml"] = (
+        f"{XML_DECLARATION}<p:sldMaster {P_NAMESPACES}>{shape_tree()}{COLOR_MAP}"
+        f"<p:sldLayoutIdLst>{layout_ids}</p:sldLayoutIdLst></p:sldMaster>"
+    )
+    parts["ppt/slideMasters/_rels/slideMaster1.xml.rels"] = relationships(
+        [
+            (f"rId{j + 1}", "slideLayout", f"../slideLayouts/slideLayout{j + 1}.xml")
+            for j in range(layouts)
+        ]
+        + [(f"rId{layouts + 1}", "theme", "../theme/theme1.xml")]
+    )
+    for j in range(1, layouts + 1):
+        name = f"ppt/slideLayouts/slideLayout{j}.xml"
+        parts[name] = (
+            f"{XML_DECLARATION}<p:sldLayout {P_NAMESPACES}>"
+            f"{shape_tree(text_shape(2, f'Layout {j}'))}</p:sldLayout>"
+        )
+        parts[f"ppt/slideLayouts/_rels/slideLayout{j}.xml.rels"] = relationships(
+            [("rId1", "slideMaster", "../slideMasters/slideMaster1.xml")]
+        )
+        overrides[name] = f"{main}.slideLayout+xml"
+
+    for n in range(1, slides + 1):
+        slide = f"ppt/slides/slide{n}.xml"
+        parts[slide] = (
+            f"{XML_DECLARATION}<p:sld {P_NAMESPACES}>"
+            f"{shape_tree(text_shape(2, f'Slide {n}: {sentence(n)}') + picture(3, 'rId3'))}"
+            "</p:sld>"
+        )
+        parts[f"ppt/slides/_rels/slide{n}.xml.rels"] = relationships(
+            [
+                (
+                    "rId1",
+                    "slideLayout",
+                    f"../slideLayouts/slideLayout{n % layouts + 1}.xml",
+                ),
+                ("rId2", "notesSlide", f"../notesSlides/notesSlide{n}.xml"),
+                ("rId3", "image", f"../media/image{n}.png"),
+            ]
+        )
+        notes = f"ppt/notesSlides/notesSlide{n}.xml"
+        parts[notes] = (
+            f"{XML_DECLARATION}<p:notes {P_NAMESPACES}>"
+            f"{shape_tree(text_shape(2, f'Notes for slide {n}'))}</p:notes>"
+        )
+        parts[f"ppt/notesSlides/_rels/notesSlide{n}.xml.rels"] = relationships(
+            [
+                ("rId1", "notesMaster", "../notesMasters/notesMaster1.xml"),
+                ("rId2", "slide", f"../slides/slide{n}.xml"),
+            ]
+        )
+        parts[f"ppt/media/image{n}.png"] = PNG
+        overrides[slide] = f"{main}.slide+xml"
+        overrides[notes] = f"{main}.notesSlide+xml"
+
+    parts["ppt/notesMasters/notesMaster1.xml"] = (
+        f"{XML_DECLARATION}<p:notesMaster {P_NAMESPACES}>{shape_tree()}{COLOR_MAP}"
+        "</p:notesMaster>"
+    )
+    parts["ppt/notesMasters/_rels/notesMaster1.xml.rels"] = relationships(
+        [("rId1", "theme", "../theme/theme1.xml")]
+    )
+    parts["ppt/theme/theme1.xml"] = (
+        f"{XML_DECLARATION}<a:theme "
+        'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" name="Theme">'
+        "<a:themeElements/></a:theme>"
+    )
+    parts["_rels/.rels"] = relationships(
+        [("rId1", "officeDocument", "ppt/presentation.xml")]
+    )
+    parts["[Content_Types].xml"] = content_types(
+        {
+            "rels": "application/vnd.openxmlformats-package.relationships+xml",
+            "xml": "application/xml",
+            "png": "image/png",
+        },
+        overrides,
+    )
+    return parts
+
+
+def generate(kind, size, directory):
+    """Write a synthetic (document, original) pair of kind and size; return their paths."""
+    directory = Path(directory)
+    extension = "pptx" if kind == "pptx" else "docx"
+    document = directory / f"{kind}-{size}.{extension}"
+    original = directory / f"{kind}-{size}.original.{extension}"
+    if kind == "docx":
+        write_package(document, docx_parts(size, tracked=True))
+        write_package(original, docx_parts(size, tracked=False))
+    elif kind == "revisions":
+        # One paragraph holding all of Claude's revisions
+        write_package(document, docx_parts(1, tracked=True, revisions=size))
+        write_package(original, docx_parts(1, tracked=False, revisions=size))
+    else:
+        parts = pptx_parts(size)
+        write_package(document, parts)
+        write_package(original, parts)
+    return document, original
+
+
+def run_case(document, original):
+    """Validate one pair in this process and return its measurements."""
+    import resource
+
+    from validation.runner import run_validation
+
+    report = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(report):
+        valid = run_validation(document, original, output_format="json")
+    seconds = time.perf_counter() - start
+
+    return {
+        "valid": valid,
+        "seconds": round(seconds, 4),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "checks": {
+            result["check"]: {
+                "seconds": round(result["elapsed"], 4),
+                "bytes_parsed": result["bytes_parsed"],
+                "passed": result["passed"],
+            }
+            for result in json.loads(report.getvalue())["checks"]
+        },
+    }
+
+
+def measure(kind, size, directory, warm_caches=False):
+    """Generate one case and validate it in a fresh process."""
+    document, original = generate(kind, size, directory)
+    env = dict(os.environ)
+    if not warm_caches:
+        env["OOXML_VALIDATION_CACHE"] = "0"
+    output = subprocess.run(
+        [sys.executable, __file__, "--run-case", str(document), str(original)],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+        cwd=Path(__file__).parent,
+    ).stdout
+    case = {
+        "format": kind,
+        "size": size,
+        "document_bytes": document.stat().st_size,
+    }
+    case.update(json.loads(output))
+    return case
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OOXML validators")
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["docx", "pptx", "revisions"],
+        default=["docx", "pptx"],
+        help="Cases to run; revisions is a .docx with all revisions in one paragraph",
+    )
+    parser.add_argument(
+        "--docx-sizes",
+        nargs="+",
+        type=int,
+        default=[100, 1000, 10000],
+        help="Paragraph counts of the generated documents",
+    )
+    parser.add_argument(
+        "--pptx-sizes",
+        nargs="+",
+        type=int,
+        default=[10, 50, 200],
+        help="Slide counts of the generated presentations",
+    )
+    parser.add_argument(
+        "--revision-counts",
+        nargs="+",
+        type=int,
+        default=[1000, 10000],
+        help="Revision counts of the revisions cases",
+    )
+    parser.add_argument(
+        "--warm-caches",
+        action="store_true",
+        help="Keep the persistent caches enabled in the measured processes",
+    )
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    parser.add_argument("--run-case", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(*args.run_case)))
+        return
+
+    cases = []
+    with tempfile.TemporaryDirectory() as directory:
+        for kind in args.formats:
+            sizes = {
+                "docx": args.docx_sizes,
+                "pptx": args.pptx_sizes,
+                "revisions": args.revision_counts,
+            }[kind]
+            for size in sizes:
+                case = measure(kind, size, directory, args.warm_caches)
+                print(
+                    f"{kind} {size}: {case['seconds']:.3f}s, "
+                    f"peak RSS {case['peak_rss_kb'] / 1024:.1f} MB",
+                    file=sys.stderr,
+                )
+                cases.append(case)
+
+    report = json.dumps(
+        {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "warm_caches": args.warm_caches,
+            "cases": cases,
+        },
+        indent=2,
+    )
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
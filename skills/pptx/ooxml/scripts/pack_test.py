@@ -0,0 +1,114 @@
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from pack import _condense_xml_dom, condense_xml
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+# Run from the ooxml/scripts directory: python -m unittest pack_test
+class TestCondenseXml(unittest.TestCase):
+    """condense_xml() must produce exactly what the minidom implementation does"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def assertCondensesLikeDom(self, data):
+        """Compare condense_xml() with _condense_xml_dom() on data (str or bytes)"""
+        path = Path(self.directory.name) / "part.xml"
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        path.write_bytes(data)
+
+        expected = _condense_xml_dom(path)
+        self.assertEqual(condense_xml(path), expected)
+        output = io.BytesIO()
+        condense_xml(path, output)
+        self.assertEqual(output.getvalue(), expected)
+        return expected
+
+    def test_pretty_printing_is_removed(self):
+        """Whitespace between elements is dropped"""
+        condensed = self.assertCondensesLikeDom(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<w:document xmlns:w="urn:w">\n  <w:body>\n    <w:p/>\n  </w:body>\n'
+            "</w:document>\n"
+        )
+        self.assertEqual(
+            condensed,
+            b'<?xml version="1.0" encoding="UTF-8"?>'
+            b'<w:document xmlns:w="urn:w"><w:body><w:p/></w:body></w:document>',
+        )
+
+    def test_whitespace_in_text_elements_is_kept(self):
+        """Whitespace-only text survives in *:t elements only"""
+        self.assertCondensesLikeDom(
+            '<w:p xmlns:w="urn:w" xmlns:a="urn:a"><w:t> </w:t><a:t>\n </a:t>'
+            "<w:r> </w:r><t> </t></w:p>"
+        )
+
+    def test_cdata(self):
+        """CDATA sections are kept, including empty ones and markup inside them"""
+        self.assertCondensesLikeDom(
+            '<w:p xmlns:w="urn:w"><w:r><![CDATA[a<b & c]]></w:r>'
+            "<w:t>x<![CDATA[]]>y</w:t><w:r><![CDATA[ ]]></w:r></w:p>"
+        )
+
+    def test_processing_instructions(self):
+        """Processing instructions are kept inside and outside the root"""
+        self.assertCondensesLikeDom(
+            '<?xml version="1.0"?>\n<?mso-application progid="Word.Document"?>\n'
+            '<w:p xmlns:w="urn:w"><?pi?><w:r><?target some data?></w:r></w:p>\n'
+            "<?after x?>"
+        )
+
+    def test_comments(self):
+        """Comments are dropped inside elements, except *:t, and kept outside the root"""
+        self.assertCondensesLikeDom(
+            '<!-- before --><w:p xmlns:w="urn:w"><!-- inside --><w:r>a<!--x-->b</w:r>'
+            "<w:t>c<!-- kept -->d</w:t><w:t><!----></w:t></w:p><!-- after -->"
+        )
+
+    def test_namespace_ordering(self):
+        """Namespace declarations come before other attributes, in document order"""
+        self.assertCondensesLikeDom(
+            '<w:document w:a="1" xmlns:w="urn:w" b="2" xmlns="urn:d" xmlns:r="urn:r">'
+            '<w:body r:id="rId1" xmlns:q="urn:q" q:x="y"><p xmlns="urn:e"/></w:body>'
+            "</w:document>"
+        )
+
+    def test_character_references(self):
+        """Character and entity references are escaped as minidom escapes them"""
+        self.assertCondensesLikeDom(
+            '<w:p xmlns:w="urn:w" w:val="a&amp;b&quot;c&lt;d&gt;e&#9;f&#10;g&#13;h&apos;">'
+            "<w:t>&amp;&lt;&gt;&quot;&apos;&#x41;&#233;&#13;&#9;&#10;</w:t>"
+            "<w:r>&#x20;</w:r><w:r>&#xE9;é]]&gt;</w:r></w:p>"
+        )
+
+    def test_crlf_line_endings(self):
+        """CRLF line endings are normalized like any other whitespace"""
+        self.assertCondensesLikeDom(
+            '<?xml version="1.0" encoding="UTF-8"?>\r\n<w:p xmlns:w="urn:w">\r\n'
+            '  <w:t xml:space="preserve">a\r\nb </w:t>\r\n  <w:r\r\n w:a="x\r\ny"/>\r\n'
+            "</w:p>\r\n"
+        )
+
+    def test_byte_order_mark(self):
+        """A UTF-8 byte order mark before the declaration is handled"""
+        self.assertCondensesLikeDom(
+            b"\xef\xbb\xbf"
+            + '<?xml version="1.0" encoding="UTF-8"?>\n<w:p xmlns:w="urn:w">'
+            "<w:t>é</w:t></w:p>".encode("utf-8")
+        )
+
+    def test_document_type(self):
+        """Parts with a document type fall back to minidom"""
+        self.assertCondensesLikeDom(
+            '<?xml version="1.0"?>\n<!DOCTYPE w:p>\n<w:p xmlns:w="urn:w"> <w:r/> </w:p>'
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
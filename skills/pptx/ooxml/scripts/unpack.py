@@ -1,29 +1,67 @@
 #!/usr/bin/env python3
-"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)"""
+"""Unpack and format XML contents of Office files (.docx, .pptx, .xlsx)
 
+Example usage:
+    python unpack.py <office_file> <output_dir> [--jobs N]
+"""
+
+import argparse
 import random
-import sys
 import defusedxml.minidom
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-# Get command line arguments
-assert len(sys.argv) == 3, "Usage: python unpack.py <office_file> <output_dir>"
-input_file, output_dir = sys.argv[1], sys.argv[2]
 
-# Extract and format
-output_path = Path(output_dir)
-output_path.mkdir(parents=True, exist_ok=True)
-zipfile.ZipFile(input_file).extractall(output_path)
+def main():
+    parser = argparse.ArgumentParser(description="Unpack an Office file")
+    parser.add_argument("input_file", help="Office file (.docx/.pptx/.xlsx)")
+    parser.add_argument("output_dir", help="Directory to unpack into")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes formatting XML parts (0 uses all CPUs, default: 1)",
+    )
+    args = parser.parse_args()
+
+    unpack_document(args.input_file, args.output_dir, jobs=args.jobs)
+
+    # For .docx files, suggest an RSID for tracked changes
+    if args.input_file.endswith(".docx"):
+        suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
+        print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+
+def unpack_document(input_file, output_dir, jobs=1):
+    """Extract an Office file and pretty print its XML parts.
 
-# Pretty print all XML files
-xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
-for xml_file in xml_files:
+    jobs is the number of processes formatting XML parts; 0 uses all CPUs.
+    """
+    # Extract and format
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    zipfile.ZipFile(input_file).extractall(output_path)
+
+    # Pretty print all XML files
+    xml_files = list(output_path.rglob("*.xml")) + list(output_path.rglob("*.rels"))
+    if jobs == 1:
+        for xml_file in xml_files:
+            pretty_print_xml(xml_file)
+    else:
+        with ProcessPoolExecutor(jobs or None) as pool:
+            # Consume the results so that errors in workers are raised here
+            for _ in pool.map(pretty_print_xml, xml_files, chunksize=8):
+                pass
+
+
+def pretty_print_xml(xml_file):
+    """Rewrite xml_file indented by two spaces, with non-ASCII characters escaped."""
     content = xml_file.read_text(encoding="utf-8")
     dom = defusedxml.minidom.parseString(content)
     xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
 
-# For .docx files, suggest an RSID for tracked changes
-if input_file.endswith(".docx"):
-    suggested_rsid = "".join(random.choices("0123456789ABCDEF", k=8))
-    print(f"Suggested RSID for edit session: {suggested_rsid}")
+
+if __name__ == "__main__":
+    main()
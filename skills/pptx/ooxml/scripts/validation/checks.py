@@ -0,0 +1,35 @@
+"""
+Cost classes and levels that decide which checks run, and in what order.
+"""
+
+# Cost classes, cheapest first:
+# cheap     - package structure: parsing, roots, relationships, content types
+# moderate  - walks over every element of the parts
+# expensive - XSD validation and comparison against the original document
+CHEAP = "cheap"
+MODERATE = "moderate"
+EXPENSIVE = "expensive"
+COST_CLASSES = (CHEAP, MODERATE, EXPENSIVE)
+
+# Levels, by the cost classes whose checks they run
+LEVELS = {
+    "quick": (CHEAP,),
+    "structural": (CHEAP, MODERATE),
+    "full": (CHEAP, MODERATE, EXPENSIVE),
+}
+DEFAULT_LEVEL = "full"
+
+
+def schedule(checks, level=DEFAULT_LEVEL, selected=None):
+    """Return the (name, cost) pairs of checks to run, cheapest class first.
+
+    checks lists a validator's (name, cost) pairs; the run is limited to the
+    cost classes of level, or to the names in selected when given. Checks
+    of the same cost class keep their listed order.
+    """
+    if selected is None:
+        costs = LEVELS[level]
+        scheduled = [(name, cost) for name, cost in checks if cost in costs]
+    else:
+        scheduled = [(name, cost) for name, cost in checks if name in selected]
+    return sorted(scheduled, key=lambda check: COST_CLASSES.index(check[1]))
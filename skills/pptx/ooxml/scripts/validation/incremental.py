@@ -0,0 +1,172 @@
+"""
+Incremental validation: reuse check results for parts that did not change.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .cache import CACHE_VERSION, cache_dir, write_json_atomic
+from .results import Issue
+
+
+class IncrementalManifest:
+    """Part hashes and per-part check results carried over between runs.
+
+    Every stored result records the key it was computed for: the hash of the
+    part plus the hashes of any parts it depends on (for example its .rels
+    file). A result is reused only while that key still matches, so a stale
+    entry can never be served. Cross-part results are keyed by a package
+    fingerprint built from the file list, every .rels file and
+    [Content_Types].xml.
+
+    One manifest is kept per package (directory or file), validator type and original
+    file, under <cache dir>/incremental.
+    """
+
+    def __init__(self, package, xml_files, original_hash, validator_name):
+        self.unpacked_dir = package.root
+        self.hashes = {
+            self._relative(f): hashlib.sha256(package.read_bytes(f)).hexdigest()
+            for f in xml_files
+        }
+        self.files = sorted(self._relative(f) for f in package.files())
+
+        name = f"{validator_name}|{self.unpacked_dir}|{original_hash}"
+        digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:32]
+        self.path = cache_dir() / "incremental" / f"{digest}.json"
+
+        previous = self._load()
+        self._previous_hashes = previous.get("hashes", {})
+        self._previous_parts = previous.get("parts", {})
+        self._previous_package = previous.get("package", {})
+        self._previous_baseline = previous.get("baseline", {})
+        self._parts = {}
+        self._package = {}
+        self._baseline = {}
+
+        self.changed = [
+            rel
+            for rel, digest in self.hashes.items()
+            if self._previous_hashes.get(rel) != digest
+        ]
+        self.reused = 0
+        self.computed = 0
+
+    def part_result(self, check, xml_file, compute, depends_on=(), extra=None):
+        """Return compute(xml_file), or the stored result if nothing it reads changed.
+
+        extra is a string describing any other input of the result (such as
+        the schemas it was validated against); a change to it also forces a
+        recompute.
+        """
+        rel = self._relative(xml_file)
+        key = self._part_key(rel, depends_on, extra)
+
+        previous = self._previous_parts.get(rel, {}).get(check)
+        if previous is not None and previous["key"] == key:
+            self.reused += 1
+            result = previous["result"]
+        else:
+            self.computed += 1
+            result = compute(xml_file)
+
+        self._parts.setdefault(rel, {})[check] = {"key": key, "result": result}
+        return result
+
+    def has_part_result(self, check, xml_file, depends_on=(), extra=None):
+        """Return True if part_result would reuse the stored result."""
+        rel = self._relative(xml_file)
+        previous = self._previous_parts.get(rel, {}).get(check)
+        return previous is not None and previous["key"] == self._part_key(
+            rel, depends_on, extra
+        )
+
+    def package_result(self, check, compute, extra=None):
+        """Return compute(), or the stored result if the package graph did not change."""
+        structural = {
+            rel: digest
+            for rel, digest in self.hashes.items()
+            if rel.endswith(".rels") or rel == "[Content_Types].xml"
+        }
+        fingerprint = hashlib.sha256(
+            json.dumps([self.files, structural, extra], sort_keys=True).encode()
+        ).hexdigest()
+
+        previous = self._previous_package.get(check)
+        if previous is not None and previous["key"] == fingerprint:
+            self.reused += 1
+            result = previous["result"]
+        else:
+            self.computed += 1
+            result = compute()
+
+        self._package[check] = {"key": fingerprint, "result": result}
+        return result
+
+    def baseline_result(self, check, compute):
+        """Return compute() for a fact about the original file, computed once per original."""
+        if check in self._previous_baseline:
+            self.reused += 1
+            result = self._previous_baseline[check]
+        else:
+            self.computed += 1
+            result = compute()
+
+        self._baseline[check] = result
+        return result
+
+    def save(self):
+        """Persist hashes and results for the next run."""
+        # Earlier results for checks that did not run this time stay valid,
+        # since each one is still guarded by its key
+        parts = {
+            rel: {**self._previous_parts.get(rel, {}), **self._parts.get(rel, {})}
+            for rel in self.hashes
+        }
+        package = {**self._previous_package, **self._package}
+        baseline = {**self._previous_baseline, **self._baseline}
+        data = {
+            "version": CACHE_VERSION,
+            "hashes": self.hashes,
+            "parts": parts,
+            "package": package,
+            "baseline": baseline,
+        }
+        try:
+            write_json_atomic(self.path, data, default=_encode_issue)
+        except OSError:
+            pass  # Only costs speed on the next run
+
+    def _part_key(self, rel, depends_on, extra=None):
+        key = "|".join(
+            self.hashes.get(name, "-")
+            for name in [rel, *(self._relative(dep) for dep in depends_on)]
+        )
+        return key if extra is None else f"{key}|{extra}"
+
+    def _relative(self, path):
+        return Path(path).relative_to(self.unpacked_dir).as_posix()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f, object_hook=_decode_issue)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data
+
+
+# Check results may hold Issues, which are stored as {"issue": [...]}
+def _encode_issue(obj):
+    if isinstance(obj, Issue):
+        return {"issue": obj.to_json()}
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def _decode_issue(data):
+    if data.keys() == {"issue"}:
+        return Issue.from_json(data["issue"])
+    return data
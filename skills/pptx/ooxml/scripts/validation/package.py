@@ -0,0 +1,120 @@
+"""
+Uniform read access to an Office package, unpacked on disk or still zipped.
+"""
+
+import threading
+import zipfile
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+
+
+def open_package(path):
+    """Return a DirectoryPackage for a directory, otherwise a ZipPackage."""
+    path = Path(path)
+    if path.is_dir():
+        return DirectoryPackage(path)
+    return ZipPackage(path)
+
+
+class DirectoryPackage:
+    """A package that has been unpacked into a directory."""
+
+    def __init__(self, path):
+        self.root = Path(path).resolve()
+
+    def files(self):
+        """Return the paths of all files in the package."""
+        return [f for f in self.root.rglob("*") if f.is_file()]
+
+    def glob(self, pattern):
+        """Return the files matching a pattern relative to the package root."""
+        return list(self.root.glob(pattern))
+
+    def rglob(self, pattern):
+        """Return the files whose name matches pattern, at any depth."""
+        return list(self.root.rglob(pattern))
+
+    def is_file(self, path):
+        """Return True if path is a file in the package."""
+        return Path(path).is_file()
+
+    def size(self, path):
+        """Return the uncompressed size of a file in bytes."""
+        return Path(path).stat().st_size
+
+    def open(self, path):
+        """Open a file in the package for binary reading."""
+        return open(path, "rb")
+
+    def read_bytes(self, path):
+        """Return the contents of a file in the package."""
+        return Path(path).read_bytes()
+
+    def close(self):
+        pass
+
+
+class ZipPackage:
+    """A packed .docx/.pptx/.xlsx, read lazily without extracting it.
+
+    Parts are addressed by virtual paths below the archive path
+    (<archive>/word/document.xml), so code written against an unpacked
+    directory can compute relative paths and sibling .rels files unchanged.
+    """
+
+    def __init__(self, path):
+        self.root = Path(path).resolve()
+        self._zip = zipfile.ZipFile(self.root, "r")
+        self._infos = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+        self._lock = threading.Lock()
+
+    def files(self):
+        """Return the paths of all parts, in archive order."""
+        return [self.root / name for name in self._infos]
+
+    def glob(self, pattern):
+        """Return the parts matching a pattern relative to the package root."""
+        pattern_parts = PurePosixPath(pattern).parts
+        return [
+            self.root / name
+            for name in self._infos
+            if len(PurePosixPath(name).parts) == len(pattern_parts)
+            and PurePosixPath(name).match(pattern)
+        ]
+
+    def rglob(self, pattern):
+        """Return the parts whose file name matches pattern, at any depth."""
+        return [
+            self.root / name
+            for name in self._infos
+            if fnmatchcase(PurePosixPath(name).name, pattern)
+        ]
+
+    def is_file(self, path):
+        """Return True if path is a part in the package."""
+        return self._name(path) in self._infos
+
+    def size(self, path):
+        """Return the uncompressed size of a part in bytes."""
+        return self._infos[self._name(path)].file_size
+
+    def open(self, path):
+        """Open a part for binary reading; the stream decompresses on demand."""
+        with self._lock:
+            return self._zip.open(self._infos[self._name(path)])
+
+    def read_bytes(self, path):
+        """Return the contents of a part."""
+        with self._lock:
+            return self._zip.read(self._infos[self._name(path)])
+
+    def close(self):
+        self._zip.close()
+
+    def _name(self, path):
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return None
@@ -0,0 +1,130 @@
+"""
+Parse-once store for the XML parts of a package under validation.
+"""
+
+import copy
+from pathlib import Path
+
+import lxml.etree
+
+
+class PartStore:
+    """Parse each XML part once and share the tree with every check.
+
+    Trees handed out by tree() and root() are shared between checks and must
+    be treated as read-only. Checks that need to mutate a part must ask for
+    their own copy().
+
+    Parts larger than stream_threshold bytes are never kept in memory:
+    events() streams them, shallow_root() reads only their root element and
+    tree() parses them afresh for the caller alone.
+    """
+
+    def __init__(self, package, stream_threshold=None):
+        self.package = package
+        self.stream_threshold = stream_threshold
+        self._trees = {}
+        self.parses = 0
+        self.requests = 0
+        self.streams = 0
+        self.bytes_parsed = 0
+
+    def is_large(self, path):
+        """Return True if path is streamed rather than kept as a parsed tree."""
+        return (
+            self.stream_threshold is not None
+            and self.package.size(path) > self.stream_threshold
+        )
+
+    def tree(self, path):
+        """Return the parsed lxml ElementTree for path (read-only)."""
+        key = str(Path(path))
+        self.requests += 1
+
+        if key not in self._trees and self.is_large(key):
+            self.parses += 1
+            return self._parse(key)
+
+        if key not in self._trees:
+            self.parses += 1
+            try:
+                self._trees[key] = self._parse(key)
+            except Exception as e:
+                # Remember the failure so every check reports the same error
+                self._trees[key] = e
+
+        result = self._trees[key]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def root(self, path):
+        """Return the root element of the parsed part (read-only)."""
+        return self.tree(path).getroot()
+
+    def shallow_root(self, path):
+        """Return the root element with its attributes and namespaces.
+
+        For large parts the children of the returned element are incomplete.
+        """
+        if not self.is_large(path):
+            return self.root(path)
+        with self.package.open(path) as source:
+            for _, elem in lxml.etree.iterparse(source, events=("start",)):
+                return elem
+
+    def events(self, path):
+        """Iterate ("start" | "end", element) pairs for every element in document order.
+
+        Small parts are walked from the shared tree. Large parts are read with
+        iterparse, and each element is cleared (and dropped from its parent)
+        once its end event has been handled, so memory use does not grow with
+        the size of the part. Consumers must not keep references to elements
+        of a large part, and must read text in the end event.
+        """
+        if not self.is_large(path):
+            return lxml.etree.iterwalk(self.root(path), events=("start", "end"))
+        return self._stream(path)
+
+    def _stream(self, path):
+        self.streams += 1
+        self.bytes_parsed += self.package.size(path)
+        with self.package.open(path) as source:
+            for event, elem in lxml.etree.iterparse(source, events=("start", "end")):
+                yield event, elem
+                if event == "end":
+                    elem.clear(keep_tail=True)
+                    # Drop already processed siblings, which only keep their tails
+                    parent = elem.getparent()
+                    if parent is not None:
+                        while elem.getprevious() is not None:
+                            del parent[0]
+
+    def check(self, path):
+        """Raise the error that makes path unparseable, if any."""
+        if not self.is_large(path):
+            self.tree(path)
+            return
+        for _ in self.events(path):
+            pass
+
+    def _parse(self, path):
+        self.bytes_parsed += self.package.size(path)
+        with self.package.open(path) as source:
+            return lxml.etree.parse(source)
+
+    def copy(self, path):
+        """Return a private, mutable copy of the part's root element."""
+        return copy.deepcopy(self.root(path))
+
+    def invalidate(self, path=None):
+        """Drop the cached tree for path, or every cached tree if path is None."""
+        if path is None:
+            self._trees.clear()
+        else:
+            self._trees.pop(str(Path(path)), None)
+
+    @property
+    def saved(self):
+        """Number of parses avoided by reusing an already parsed tree."""
+        return self.requests - self.parses
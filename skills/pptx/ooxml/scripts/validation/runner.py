@@ -0,0 +1,232 @@
+"""
+Run the validators for one document, as the command line tool does.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import traceback
+from pathlib import Path
+
+from .base import BaseSchemaValidator
+from .cache import BASELINE_ERROR_CACHE
+from .checks import DEFAULT_LEVEL, schedule
+from .docx import DOCXSchemaValidator
+from .pptx import PPTXSchemaValidator
+from .redlining import RedliningValidator
+from .results import format_profile, run_check
+from .schemas import SCHEMA_BUNDLES, SCHEMAS_DIR
+
+
+def validators_for(original_file):
+    """Return the validator classes for the original's file type, or None."""
+    match Path(original_file).suffix.lower():
+        case ".docx":
+            return [DOCXSchemaValidator, RedliningValidator]
+        case ".pptx":
+            return [PPTXSchemaValidator]
+        case _:
+            return None
+
+
+def available_checks(validator_class):
+    """Return the names of the checks a validator class can run."""
+    return [name for name, cost in validator_class.CHECKS]
+
+
+def run_validation(
+    document,
+    original_file,
+    verbose=False,
+    incremental=False,
+    jobs=1,
+    checks=None,
+    level=DEFAULT_LEVEL,
+    fail_fast=False,
+    output_format="text",
+    profile=False,
+):
+    """Validate document against original_file and print the report.
+
+    By default the checks of level run (see checks.LEVELS); checks
+    optionally names the checks to run instead (see available_checks()).
+    With fail_fast, the run stops after the first cost class with a
+    failure, which also skips the validators that would come later.
+
+    output_format "json" replaces the text report with one JSON document
+    holding the structured result of every check (see CheckResult) and the
+    text report itself. profile adds a table of per-check timings (to
+    stderr for JSON output). Returns True if all validations passed.
+    """
+    results = []
+    if output_format == "json":
+        report = io.StringIO()
+        with contextlib.redirect_stdout(report):
+            success = _run_validators(
+                document,
+                original_file,
+                results,
+                verbose=verbose,
+                incremental=incremental,
+                jobs=jobs,
+                checks=checks,
+                level=level,
+                fail_fast=fail_fast,
+            )
+        print(
+            json.dumps(
+                {
+                    "document": str(document),
+                    "original": str(original_file),
+                    "valid": success,
+                    "elapsed": round(sum(r.elapsed for r in results), 6),
+                    "checks": [result.to_dict() for result in results],
+                    "output": report.getvalue(),
+                },
+                indent=2,
+            )
+        )
+    else:
+        success = _run_validators(
+            document,
+            original_file,
+            results,
+            verbose=verbose,
+            incremental=incremental,
+            jobs=jobs,
+            checks=checks,
+            level=level,
+            fail_fast=fail_fast,
+        )
+
+    if profile:
+        print(
+            f"\n{format_profile(results)}",
+            file=sys.stderr if output_format == "json" else sys.stdout,
+        )
+
+    return success
+
+
+def _run_validators(
+    document,
+    original_file,
+    results,
+    verbose,
+    incremental,
+    jobs,
+    checks,
+    level,
+    fail_fast,
+):
+    """Run the validators for the original's file type, adding to results."""
+    validators = validators_for(original_file)
+    if validators is None:
+        file_extension = Path(original_file).suffix.lower()
+        print(f"Error: Validation not supported for file type {file_extension}")
+        return False
+
+    if checks is not None:
+        known = {name for V in validators for name in available_checks(V)}
+        unknown = [name for name in checks if name not in known]
+        if unknown:
+            print(
+                f"Error: Unknown check(s): {', '.join(unknown)} "
+                f"(available: {', '.join(sorted(known))})"
+            )
+            return False
+
+    success = True
+    for V in validators:
+        if fail_fast and not success:
+            break
+        if not schedule(V.CHECKS, level, checks):
+            continue
+
+        options = {"verbose": verbose}
+        if issubclass(V, BaseSchemaValidator):
+            options["incremental"] = incremental
+            options["jobs"] = jobs
+        validator = V(document, original_file, **options)
+        try:
+            if issubclass(V, BaseSchemaValidator):
+                valid = validator.validate(level, fail_fast, checks)
+                results.extend(validator.results)
+            else:
+                # Validators without a check list run as their single check
+                result = run_check(
+                    V.__name__,
+                    V.CHECKS[0][0],
+                    validator.validate,
+                    lambda validator=validator: validator.bytes_parsed,
+                )
+                result.issues = validator.issues
+                results.append(result)
+                valid = result.passed
+        finally:
+            validator.package.close()
+        if not valid:
+            success = False
+
+    if success:
+        print("All validations PASSED!")
+
+    return success
+
+
+def build_schema_bundles():
+    """(Re)build the bundle of every root schema the validators use; return their paths."""
+    paths = sorted(
+        {
+            (SCHEMAS_DIR / name).resolve()
+            for name in BaseSchemaValidator.SCHEMA_MAPPINGS.values()
+        }
+    )
+    for path in paths:
+        SCHEMA_BUNDLES.build(str(path))
+    return paths
+
+
+def run_request(request):
+    """Run one validate request with its output captured; return output and exit code.
+
+    request holds the absolute "document" and "original" paths and the
+    command line options "verbose", "incremental", "jobs", "checks",
+    "level", "fail_fast", "format", "profile" and "no_cache". The response
+    holds everything the run printed to stdout and stderr and the exit code
+    the one-shot command would have returned. Used by the validation server
+    and the batch workers.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    cache_enabled = BASELINE_ERROR_CACHE.enabled
+
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            if request.get("no_cache"):
+                BASELINE_ERROR_CACHE.enabled = False
+            success = run_validation(
+                request["document"],
+                request["original"],
+                verbose=request.get("verbose", False),
+                incremental=request.get("incremental", False),
+                jobs=request.get("jobs", 1),
+                checks=request.get("checks"),
+                level=request.get("level", DEFAULT_LEVEL),
+                fail_fast=request.get("fail_fast", False),
+                output_format=request.get("format", "text"),
+                profile=request.get("profile", False),
+            )
+            exit_code = 0 if success else 1
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            BASELINE_ERROR_CACHE.enabled = cache_enabled
+
+    return {
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+        "exit_code": exit_code,
+    }